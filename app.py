@@ -46,11 +46,14 @@ from __future__ import annotations
 # =========================
 # Standard Library Imports
 # =========================
+import atexit
 import json
 import os
+import queue
+import threading
 from calendar import monthrange
 from datetime import datetime, timedelta, date
-from functools import wraps
+from functools import lru_cache, wraps
 from typing import Any, Dict, List, Optional, Tuple
 from itertools import groupby as igroupby
 
@@ -69,15 +72,34 @@ from flask import (
     jsonify,
     Blueprint,
 )
+from flask.sessions import SessionInterface
+from werkzeug.security import check_password_hash, generate_password_hash
+
+# Optional: WhiteNoise serves /static/* straight from the WSGI layer, so asset
+# requests never reach Flask routing, hooks or the session machinery.
+try:
+    from whitenoise import WhiteNoise
+except ImportError:
+    WhiteNoise = None
+
+# Optional: server-side sessions in Redis (enabled via SESSION_REDIS_URL)
+try:
+    import redis
+    from flask_session import Session
+except ImportError:
+    redis = None
+    Session = None
 
 
 # =========================
 # Local Modules
 # =========================
+# JSON codec (orjson when installed, stdlib json otherwise) + durable writes
+from atomic_io import atomic_write_bytes, dumps_indent, loads
 from pending_store import list_pending, add_pending, remove_pending
 import requests_data
 import secrets
-from request_log import request_log, log_request, get_request_log
+from request_log import request_log, log_request, get_request_log, iter_request_log
 
 
 # =========================
@@ -94,6 +116,7 @@ STATUS_FILE = os.path.join(DATA_DIR, "status_log.json")    # Per-date per-user a
 TRAINING_DAYS_FILE = os.path.join(DATA_DIR, "training_days.json")  # NCCPD training day assignments (separate store)
 TOW_LOG_FILE = os.path.join(DATA_DIR, "tow_log.json")  # Public tow submissions (append-only)
 TOW_COMPANIES_FILE = os.path.join(DATA_DIR, "tow_companies.json")  # Allow-list of valid tow companies (id -> {name, active})
+SICK_RESET_MARKER = os.path.join(DATA_DIR, ".sick_reset_year")  # Last year sick_used_ytd was reset (plain int)
 
 # Role names used by @require_role() (string matching; keep stable)
 ROLES: List[str] = ["user", "supervisor", "admin", "webmaster"]
@@ -110,6 +133,63 @@ MAX_FORWARD_DAYS = 30  # supervisor tool forward-date cap (UI + server)
 app = Flask(__name__)
 app.secret_key = os.environ.get("FLASK_SECRET_KEY", "supersecretkey")
 
+# Diagnostics go through app.logger (never print()) with lazy %-formatting, so
+# debug-level messages cost nothing unless enabled. Production default: INFO.
+app.logger.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
+
+# Server-side sessions: with SESSION_REDIS_URL set (and Flask-Session + redis
+# installed) the cookie carries only a session id and the data is one Redis GET,
+# instead of an itsdangerous-signed payload verified on every request.
+# Default stays the signed cookie so dev setups need nothing extra.
+SESSION_REDIS_URL = os.environ.get("SESSION_REDIS_URL", "").strip()
+if SESSION_REDIS_URL and Session is not None:
+    app.config.update(
+        SESSION_TYPE="redis",
+        SESSION_REDIS=redis.Redis.from_url(SESSION_REDIS_URL),
+        SESSION_USE_SIGNER=True,  # session id cookie is still signed
+    )
+    Session(app)  # replaces app.session_interface; wrapped below
+
+
+# --- Static assets skip the session ------------------------------------------
+# Requests under /static/ never need the session (cookie or Redis). Wrapping the
+# active session interface hands them a null session, so no cookie is parsed
+# or re-signed; the before_request hooks below also return early for them.
+class StaticRequestFilteringSessionInterface(SessionInterface):
+    """Delegate to `inner` except for static asset requests (null session)."""
+
+    def __init__(self, inner: SessionInterface) -> None:
+        self._inner = inner
+
+    def open_session(self, app, request):
+        if request.path.startswith(app.static_url_path + "/"):
+            return self.make_null_session(app)
+        return self._inner.open_session(app, request)
+
+    def save_session(self, app, session, response):
+        if self.is_null_session(session):
+            return None
+        return self._inner.save_session(app, session, response)
+
+
+app.session_interface = StaticRequestFilteringSessionInterface(app.session_interface)
+
+# Static assets at the WSGI layer when WhiteNoise is installed (a reverse proxy
+# serving /static/ works too -- see readme). Assets are cached client-side for a year.
+STATIC_MAX_AGE = 365 * 24 * 3600
+if WhiteNoise is not None:
+    app.wsgi_app = WhiteNoise(
+        app.wsgi_app,
+        root=app.static_folder,
+        prefix=app.static_url_path,
+        max_age=STATIC_MAX_AGE,
+    )
+
+
+def _is_static_request() -> bool:
+    """True for /static/* requests (used by global hooks to skip work)."""
+    return request.path.startswith(app.static_url_path + "/")
+
 # --- Blueprint: Tow Log ----------------------------------------------------
 # Phase 1: Keep in this file to minimize risk; later we can move to blueprints/tow.py
 # without changing behavior.
@@ -144,7 +224,7 @@ def require_role(*roles: str):
                 flash("Please log in.", "warning")
                 return redirect(url_for("login"))
             try:
-                all_users = load_users()
+                all_users = load_users_cached()
             except Exception:
                 flash("Temporary error loading users. Please log in again.", "error")
                 return redirect(url_for("login"))
@@ -335,7 +415,7 @@ def day_status_preview():
     Query params: username, start_date, end_date (optional), status
     Output: list of {date, current_status, will_change: bool, reason: 'vacation'|'sick'|'none'|'same'}
     """
-    all_users = load_users()
+    all_users = load_users_cached()
     actor_username = get_current_username()
     actor = all_users.get(actor_username, {}) if actor_username else {}
     actor_role = actor.get("role", "user")
@@ -375,7 +455,7 @@ def day_status_preview():
         status_req = "Available"
     PROTECTED = {"Vacation", "Sick"}
 
-    status_log = load_status_log()
+    status_log = load_status_log_cached()
     out = []
     cur = start_dt
     while cur <= end_dt:
@@ -419,50 +499,227 @@ USER_NUMERIC_FIELDS = {"vacation_left", "vacation_used_today", "sick_left", "sic
 # =========================
 def _read_json(path: str, default: Any) -> Any:
     """Read JSON file at `path`; return `default` if missing/corrupt."""
+    # A snapshot still queued for the background writer is newer than the file
+    with _pending_lock:
+        pending = _pending_writes.get(path)
     try:
-        with open(path, "r") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError, OSError):
+        if pending is not None:
+            return loads(pending)
+        with open(path, "rb") as f:
+            return loads(f.read())
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    except (FileNotFoundError, json.JSONDecodeError, UnicodeDecodeError, OSError):
         return default
 
 
 def _write_json(path: str, payload: Any) -> None:
     """
-    Write `payload` to `path` with indent. Swallow OS errors (best-effort).
+    Write `payload` to `path` with indent, atomically and durably (see
+    atomic_io.atomic_write_bytes). Swallow OS errors (best-effort).
     """
+    with _io_lock:
+        # A direct write supersedes any older snapshot still queued for `path`
+        with _pending_lock:
+            _pending_writes.pop(path, None)
+            _write_seq[path] = _write_seq.get(path, 0) + 1
+        try:
+            atomic_write_bytes(path, dumps_indent(payload))  # one buffer, one write
+        except OSError as e:
+            # Intentional: the app favors continuity over crashes in read-mostly flows.
+            app.logger.warning("JSON write failed for %s: %s", path, e)
+
+
+# =========================
+# Write-behind: background JSON writer
+# =========================
+# Bulk admin actions (training days, accrual) rewrite large stores. Instead of
+# making the response wait on the rewrite, the route serializes a snapshot and
+# hands it to a single daemon writer thread:
+#   * `_pending_writes` keeps only the LATEST snapshot per path, so a burst of
+#     saves to the same file coalesces into one write.
+#   * `_read_json` serves a pending snapshot before the file, so readers always
+#     see the newest data even before it reaches disk.
+#   * `flush_writes()` blocks until the queue drains; registered with atexit.
+#   * The thread is started lazily by `_write_json_async` and restarted if it is
+#     not running in this process (worker forked after import, or it died), so
+#     a queued snapshot can never sit unwritten behind a dead writer.
+_pending_writes: Dict[str, bytes] = {} # path -> serialized JSON awaiting write
+_pending_lock = threading.Lock()       # guards _pending_writes and _write_seq
+_write_seq: Dict[str, int] = {}        # path -> count of in-process saves (see _file_version)
+_io_lock = threading.Lock()            # serializes file writes between writer + request threads
+writer_queue: "queue.Queue[str]" = queue.Queue()  # paths with a pending snapshot
+_writer_thread: Optional[threading.Thread] = None  # see _ensure_writer
+_writer_start_lock = threading.Lock()  # one starter at a time
+
+
+def _writer_loop() -> None:
+    """Daemon loop: write the latest pending snapshot for each queued path."""
+    while True:
+        path = writer_queue.get()
+        try:
+            with _io_lock:
+                with _pending_lock:
+                    data = _pending_writes.get(path)
+                if data is None:
+                    continue  # already written (coalesced) or superseded by a direct write
+                atomic_write_bytes(path, data)
+                with _pending_lock:
+                    # Drop the snapshot only if no newer one arrived meanwhile
+                    if _pending_writes.get(path) is data:
+                        del _pending_writes[path]
+        except OSError as e:
+            # best-effort, same contract as _write_json
+            app.logger.warning("Background JSON write failed for %s: %s", path, e)
+        except Exception:
+            # Never let one bad snapshot kill the thread (flush_writes would hang)
+            app.logger.exception("Background JSON writer error for %s", path)
+        finally:
+            writer_queue.task_done()
+
+
+def _ensure_writer() -> None:
+    """Start the writer thread if it is not running in this process."""
+    global _writer_thread
+    if _writer_thread is not None and _writer_thread.is_alive():
+        return
+    with _writer_start_lock:
+        if _writer_thread is None or not _writer_thread.is_alive():
+            _writer_thread = threading.Thread(target=_writer_loop, name="json-writer", daemon=True)
+            _writer_thread.start()
+
+
+def _write_json_async(path: str, payload: Any) -> None:
+    """Queue a snapshot of `payload` for the background writer (returns immediately)."""
+    data = dumps_indent(payload)  # snapshot now; caller may keep mutating payload
+    with _pending_lock:
+        _pending_writes[path] = data
+        _write_seq[path] = _write_seq.get(path, 0) + 1
+    _ensure_writer()
+    writer_queue.put(path)
+
+
+def _file_version(path: str) -> Tuple[int, int, int]:
+    """
+    Cheap change token for a JSON store: (in-process save count, mtime_ns, size).
+    The save count covers snapshots still queued for the writer; the stat
+    fields cover hand edits made outside the app. Missing file -> zeros.
+    """
+    with _pending_lock:
+        seq = _write_seq.get(path, 0)
     try:
-        with open(path, "w") as f:
-            json.dump(payload, f, indent=2)
+        st = os.stat(path)
+        return (seq, st.st_mtime_ns, st.st_size)
     except OSError:
-        # Intentional: the app favors continuity over crashes in read-mostly flows.
-        # Consider structured logging in production to capture these events.
-        pass
+        return (seq, 0, 0)
+
+
+def _write_pending_now() -> None:
+    """Write every queued snapshot synchronously (no writer thread needed)."""
+    with _io_lock:
+        with _pending_lock:
+            snapshot = list(_pending_writes.items())
+        for path, data in snapshot:
+            try:
+                atomic_write_bytes(path, data)
+            except OSError as e:
+                app.logger.warning("JSON write failed for %s: %s", path, e)
+                continue
+            with _pending_lock:
+                if _pending_writes.get(path) is data:
+                    del _pending_writes[path]
+
+
+def flush_writes() -> None:
+    """Block until every queued snapshot has been written to disk.
+    Without a live writer thread, the snapshots are written here instead of
+    waiting on a queue nobody drains."""
+    if _writer_thread is not None and _writer_thread.is_alive():
+        writer_queue.join()
+    else:
+        _write_pending_now()
+
+
+def _reset_writer_after_fork() -> None:
+    """Child process: the parent's writer thread does not exist here, and its
+    locks/queue may have been copied mid-use. Start fresh; snapshots inherited
+    in `_pending_writes` are re-queued for a lazily started writer."""
+    global _pending_lock, _io_lock, writer_queue, _writer_thread, _writer_start_lock
+    _pending_lock = threading.Lock()
+    _io_lock = threading.Lock()
+    _writer_start_lock = threading.Lock()
+    writer_queue = queue.Queue()
+    _writer_thread = None
+    if _pending_writes:
+        _ensure_writer()
+        for path in list(_pending_writes):
+            writer_queue.put(path)
+
+
+if hasattr(os, "register_at_fork"):  # POSIX only
+    os.register_at_fork(after_in_child=_reset_writer_after_fork)
+atexit.register(flush_writes)
+
+
+# =========================
+# Read cache (parsed JSON keyed on file version)
+# =========================
+# Read-mostly paths (auth decorator, calendar, landing, day view) used to
+# re-open and re-parse the same JSON on every request. `_cached_json` keeps the
+# parsed object per path and reparses only when `_file_version(path)` changes.
+# Cached objects are SHARED across requests: treat them as read-only. Routes
+# that mutate and save must keep using the fresh loaders (load_users(), ...).
+_json_cache: Dict[str, Tuple[Tuple[int, int, int], Any]] = {}
+
+
+def _cached_json(path: str, default: Any) -> Any:
+    """Parsed JSON for `path`, reparsed only when the file version changes."""
+    version = _file_version(path)  # take the token BEFORE reading (never cache old data under a new token)
+    hit = _json_cache.get(path)
+    if hit is not None and hit[0] == version:
+        return hit[1]
+    data = _read_json(path, default=default)
+    _json_cache[path] = (version, data)
+    return data
 
 
 def load_users() -> Dict[str, Dict[str, Any]]:
-    """Load all user profiles keyed by username."""
+    """Load all user profiles keyed by username (fresh copy; safe to mutate + save)."""
     return _read_json(USERS_FILE, default={})
 
 
+def load_users_cached() -> Dict[str, Dict[str, Any]]:
+    """Read-only view of all user profiles (shared cache; do NOT mutate)."""
+    return _cached_json(USERS_FILE, default={})
+
+
 def save_users(all_users: Dict[str, Dict[str, Any]]) -> None:
     """Persist all user profiles to disk."""
     _write_json(USERS_FILE, all_users)
 
 
+def save_users_async(all_users: Dict[str, Dict[str, Any]]) -> None:
+    """Queue all user profiles for the background writer (see write-behind notes)."""
+    _write_json_async(USERS_FILE, all_users)
+
+
 def save_users_atomic(all_users: Dict[str, Dict[str, Any]]) -> None:
     """
     Atomically persist all user profiles to disk to avoid partial writes.
-    Writes to USERS_FILE + '.tmp' then replaces the original.
+    Temp file + fsync + os.replace + directory fsync (atomic_io.atomic_write_bytes).
     """
-    tmp_path = USERS_FILE + ".tmp"
-    with open(tmp_path, "w") as f:
-        json.dump(all_users, f, indent=2)
-    os.replace(tmp_path, USERS_FILE)
+    with _io_lock:
+        with _pending_lock:
+            _pending_writes.pop(USERS_FILE, None)
+            _write_seq[USERS_FILE] = _write_seq.get(USERS_FILE, 0) + 1
+        atomic_write_bytes(USERS_FILE, dumps_indent(all_users))
 
 
 def load_shifts() -> Dict[str, Dict[str, str]]:
-    """Load daily shift assignments: {YYYY-MM-DD: {squad: label}}."""
-    return _read_json(SHIFTS_FILE, default={})
+    """
+    Load daily shift assignments: {YYYY-MM-DD: {squad: label}}.
+    The app never writes shifts, so this is always the shared read cache (do NOT mutate).
+    """
+    return _cached_json(SHIFTS_FILE, default={})
 
 
 def load_status_log() -> Dict[str, Dict[str, str]]:
@@ -470,18 +727,52 @@ def load_status_log() -> Dict[str, Dict[str, str]]:
     return _read_json(STATUS_FILE, default={})
 
 
+def load_status_log_cached() -> Dict[str, Dict[str, str]]:
+    """Read-only view of status overrides (shared cache; do NOT mutate)."""
+    return _cached_json(STATUS_FILE, default={})
+
+
 def save_status_log(status_log: Dict[str, Dict[str, str]]) -> None:
     """Persist status overrides to disk."""
     _write_json(STATUS_FILE, status_log)
 
 
-def load_training_days() -> List[Dict[str, Any]]:
-    """Load training day entries list (each entry is a dict)."""
-    return _read_json(TRAINING_DAYS_FILE, default=[])
+def save_status_log_async(status_log: Dict[str, Dict[str, str]]) -> None:
+    """Queue status overrides for the background writer."""
+    _write_json_async(STATUS_FILE, status_log)
+
 
-def save_training_days(entries: List[Dict[str, Any]]) -> None:
-    """Persist training day entries to disk."""
-    _write_json(TRAINING_DAYS_FILE, entries)
+def training_day_id(date_str: str, officer: str) -> str:
+    """Stable id for a training assignment; one per (date, officer)."""
+    return f"td_{date_str}_{officer}"
+
+
+def load_training_days() -> Dict[str, Dict[str, Any]]:
+    """
+    Load training day entries keyed by id: {id: entry}.
+    On disk: {"entries": {id: entry, ...}}. Legacy files holding a flat list
+    are converted on read (first entry wins for duplicate ids).
+    """
+    data = _read_json(TRAINING_DAYS_FILE, default={})
+    if isinstance(data, dict):
+        entries = data.get("entries")
+        return entries if isinstance(entries, dict) else {}
+    out: Dict[str, Dict[str, Any]] = {}
+    if isinstance(data, list):
+        for e in data:
+            if not isinstance(e, dict):
+                continue
+            td_id = e.get("id") or training_day_id(e.get("date", ""), e.get("officer", ""))
+            out.setdefault(td_id, e)
+    return out
+
+def save_training_days(entries: Dict[str, Dict[str, Any]]) -> None:
+    """Persist training day entries ({id: entry}) to disk."""
+    _write_json(TRAINING_DAYS_FILE, {"entries": entries})
+
+def save_training_days_async(entries: Dict[str, Dict[str, Any]]) -> None:
+    """Queue training day entries for the background writer."""
+    _write_json_async(TRAINING_DAYS_FILE, {"entries": entries})
 
 
 def load_tow_log() -> List[Dict[str, Any]]:
@@ -540,6 +831,20 @@ def compute_end_time_str(start_dt: Optional[datetime]) -> str:
     return (start_dt + timedelta(hours=11, minutes=15)).strftime("%H:%M")
 
 
+# start_time string -> end-of-shift "HH:MM" (or "Unknown"); only a handful of
+# distinct start times exist, so each is parsed/formatted once per process
+END_TIME: Dict[Optional[str], str] = {}
+
+
+def end_of_shift(start: Optional[str]) -> str:
+    """Memoized compute_end_time_str(safe_parse_hhmm(start)) for roster rows."""
+    end = END_TIME.get(start)
+    if end is None:
+        end = compute_end_time_str(safe_parse_hhmm(start, fallback="07:00"))
+        END_TIME[start] = end
+    return end
+
+
 def zone_of(call_sign: str) -> str:
     """Derive patrol zone from first digit of call sign; else 'Other'."""
     if not call_sign:
@@ -582,17 +887,46 @@ def rotation_label(date_str: str, squad: Optional[str]) -> Optional[str]:
 
 
 
+# Precomputed month geometry for the years the calendar realistically shows.
+# MONTH_META: (year, month) -> (start_weekday Sunday=0, num_days)
+# CELL_DATES: (year, month) -> ("YYYY-MM-01", ..., last day) for the grid loop
+MONTH_META_YEARS = range(2024, 2030)
+MONTH_META: Dict[Tuple[int, int], Tuple[int, int]] = {
+    (y, m): ((datetime(y, m, 1).weekday() + 1) % 7, monthrange(y, m)[1])
+    for y in MONTH_META_YEARS
+    for m in range(1, 13)
+}
+CELL_DATES: Dict[Tuple[int, int], Tuple[str, ...]] = {
+    (y, m): tuple(f"{y:04d}-{m:02d}-{d:02d}" for d in range(1, n + 1))
+    for (y, m), (_, n) in MONTH_META.items()
+}
+
+
 def month_bounds(year: int, month: int) -> Tuple[datetime, int, int]:
     """
     Return (first_day, num_days, start_weekday) for a given month.
     - start_weekday: 0..6, Sunday=0 (template expects this mapping)
+    Table lookup for MONTH_META years; computed for anything outside it.
     """
     first_day = datetime(year, month, 1)  # 1st of requested month
+    meta = MONTH_META.get((year, month))
+    if meta is not None:
+        start_weekday, num_days = meta
+        return first_day, num_days, start_weekday
     _, num_days = monthrange(year, month) # number of days in month
     # Python weekday(): Monday=0..Sunday=6 → convert so Sunday=0..Saturday=6
     start_weekday = (first_day.weekday() + 1) % 7
     return first_day, num_days, start_weekday
 
+
+def month_cell_dates(year: int, month: int) -> Tuple[str, ...]:
+    """ISO date strings for every day of the month (CELL_DATES or computed)."""
+    dates = CELL_DATES.get((year, month))
+    if dates is None:
+        _, num_days, _ = month_bounds(year, month)
+        dates = tuple(f"{year:04d}-{month:02d}-{d:02d}" for d in range(1, num_days + 1))
+    return dates
+
 # =========================
 # NCCPD ONLY: Accrual helpers (vacation entitlement, carryover, min-use)
 # =========================
@@ -916,6 +1250,37 @@ def audit_append(all_users: Dict[str, Dict[str, Any]], target_username: str,
     if save_immediately:
         save_users(all_users)
 
+def audit_append_bulk(all_users: Dict[str, Dict[str, Any]],
+                      events: List[Tuple[str, str, Dict[str, Any]]],
+                      save_immediately: bool = True) -> None:
+    """
+    Append many audit events in one pass: events = [(target_username, action, details), ...].
+    Same event shape and 500-entry ring-buffer as audit_append(); the timestamp
+    and actor are resolved once for the whole batch. Saves at most once.
+    """
+    ts = _now_iso()
+    actor = _actor()
+    touched = False
+    for target_username, action, details in events:
+        user = all_users.get(target_username)
+        if not user:
+            continue  # target user not found; nothing to write
+        audit = user.get("audit")
+        if not isinstance(audit, list):
+            audit = user["audit"] = []
+        audit.append({
+            "ts": ts,
+            "action": action,
+            "actor": dict(actor),  # per-event copy; events must not share a mutable dict
+            "details": details or {},
+        })
+        if len(audit) > 500:
+            user["audit"] = audit[-500:]
+        touched = True
+
+    if save_immediately and touched:
+        save_users(all_users)
+
 def diff_fields(before: Dict[str, Any], after: Dict[str, Any], fields: List[str]) -> Dict[str, Dict[str, Any]]:
     """
     Return {field: {'from': X, 'to': Y}} for changed fields only.
@@ -933,11 +1298,7 @@ def diff_fields(before: Dict[str, Any], after: Dict[str, Any], fields: List[str]
 # (require_role and 403 handler defined earlier to satisfy decorator ordering)
 
 
-@app.before_request
-def _ensure_csrf_token():
-    # create once per session
-    if 'csrf_token' not in session:
-        session['csrf_token'] = secrets.token_urlsafe(32)
+# (CSRF token bootstrap lives with the CSRF guard near the end of this file)
 
 
  
@@ -947,16 +1308,42 @@ def _ensure_csrf_token():
 @app.before_first_request
 def reset_sick_usage_if_needed() -> None:
     """
-    On first request after server start: if today is Jan 1, reset sick_used_ytd.
+    On first request after server start: reset sick_used_ytd once per calendar
+    year, tracked by the SICK_RESET_MARKER file (so a restart on Jan 2 still resets).
     (Keeps previous year’s totals from carrying over.)
+    A missing marker is seeded with the current year; a corrupt one is logged
+    and left alone (no reset, no rewrite).
     """
-    today = datetime.today()
-    if today.month == 1 and today.day == 1:
+    current = datetime.now().year
+    try:
+        with open(SICK_RESET_MARKER) as f:
+            last = int(f.read().strip())
+    except FileNotFoundError:
+        last = None
+    except (OSError, ValueError) as e:
+        # Unreadable/corrupt marker: we cannot tell whether this year's reset
+        # already ran. Resetting could wipe mid-year counters and seeding would
+        # silently skip a reset, so do neither; leave the marker for an admin.
+        app.logger.warning(
+            "Sick reset skipped: %s is unreadable (%s); fix or delete it", SICK_RESET_MARKER, e
+        )
+        return
+
+    # No marker yet (fresh deploy / upgrade): adopt the current year without
+    # wiping counters that are already mid-year
+    if last is not None and last < current:
         all_users = load_users()
         for user_data in all_users.values():
             user_data["sick_used_ytd"] = 0
         save_users(all_users)
 
+    if last != current:
+        try:
+            # Atomic: a crash mid-write must not leave a corrupt marker behind
+            atomic_write_bytes(SICK_RESET_MARKER, str(current).encode("ascii"))
+        except OSError as e:
+            app.logger.warning("Could not write %s: %s", SICK_RESET_MARKER, e)
+
 @app.context_processor
 def _inject_csrf_token():
     # exposes csrf_token() to templates
@@ -978,15 +1365,15 @@ def _enforce_active_user():
     If a logged-in user has been archived (is_active=False),
     immediately end their session and send them to login.
     """
-    # Allow reaching login/logout without a loop
-    if request.endpoint in {"login", "logout"}:
+    # Allow reaching login/logout without a loop; static assets carry no session
+    if request.endpoint in {"login", "logout"} or _is_static_request():
         return  # Skip enforcement for auth endpoints
 
     uname = session.get("username")
     if not uname:
         return  # Not logged in; nothing to enforce
 
-    users = load_users()               # Read the latest archive flags
+    users = load_users_cached()        # Read the latest archive flags (cached per file version)
     u = users.get(uname)
     # Treat missing flag as active by default; only block explicit False
     if u and (u.get("is_active", True) is False):
@@ -996,9 +1383,58 @@ def _enforce_active_user():
 
 
  
+# =========================
+# Rendered-page cache
+# =========================
+# Some pages render identical HTML until their inputs change. The caller builds
+# a key from everything the page depends on (file versions, viewer, CSRF token)
+# and gets the stored HTML back, skipping the view work and the Jinja render.
+# Pages with pending flash messages are never cached or served from cache:
+# the template consumes the flashes, and a cached copy would drop or replay them.
+_VIEW_CACHE_MAX = 256
+_view_cache: Dict[Tuple[Any, ...], str] = {}
+
+
+def _view_cache_get(key: Tuple[Any, ...]) -> Optional[str]:
+    """Cached HTML for `key`, or None (always None while flashes are pending)."""
+    if session.get("_flashes"):
+        return None
+    return _view_cache.get(key)
+
+
+def _view_cache_put(key: Tuple[Any, ...], html: str) -> str:
+    """Store `html` under `key` (unless flashes were pending) and return it."""
+    if not session.get("_flashes"):
+        if len(_view_cache) >= _VIEW_CACHE_MAX:
+            _view_cache.clear()  # crude bound; entries are cheap to rebuild
+        _view_cache[key] = html
+    return html
+
+
 # =========================
 # Calendar: Month View
 # =========================
+@lru_cache(maxsize=64)
+def _calendar_base_cells(year: int, month: int, shifts_version: Tuple[int, int, int]):
+    """
+    Viewer-independent month grid, memoized per (year, month, shifts.json version).
+    Returns a tuple: `None` padding for the leading weekdays, then one dict per
+    day with date/day/shifts (+ holiday_name on holidays). Shared across
+    requests; calendar_view copies each cell before adding per-viewer flags.
+    """
+    _, _, start_weekday = month_bounds(year, month)
+    shifts = load_shifts()
+    holiday_map = get_holidays_map(year)  # {'YYYY-MM-DD': 'Holiday Name', ...}
+    cells: List[Optional[Dict[str, Any]]] = [None] * start_weekday
+    for day, date_str in enumerate(month_cell_dates(year, month), start=1):
+        cell = {"date": date_str, "day": day, "shifts": shifts.get(date_str, {})}
+        name = holiday_map.get(date_str)
+        if name:
+            cell["holiday_name"] = name  # visual-only tag
+        cells.append(cell)
+    return tuple(cells)
+
+
 @app.route("/calendar")
 def calendar_view():
     """
@@ -1016,56 +1452,41 @@ def calendar_view():
     except ValueError:
         year, month = today.year, today.month
 
-    first_day, num_days, start_weekday = month_bounds(year, month)
-    shifts = load_shifts()
+    first_day, _, _ = month_bounds(year, month)
 
     # Determine viewer's squad (if logged in) to compute highlights
     user_squad = None
     username = get_current_username()
     if username:
         try:
-            all_users = load_users()  # needed only to look up viewer's squad
+            all_users = load_users_cached()  # needed only to look up viewer's squad
             user_squad = all_users.get(username, {}).get("squad")
         except Exception:
             user_squad = None
 
-    # Build day cells, padding with leading blanks for starting weekday
-    cells: List[Optional[Dict[str, Any]]] = [None] * start_weekday
-    for day in range(1, num_days + 1):
-        date_str = f"{year:04d}-{month:02d}-{day:02d}"
-        day_shifts = shifts.get(date_str, {})
-        # If viewer has a squad and it’s ON that day, mark highlight
-        is_user_squad = False
-        user_shift_label = None
-        if user_squad:
-            label = day_shifts.get(user_squad)
-            if is_on(label):
-                is_user_squad = True
-                user_shift_label = label
-        cells.append(
-            {
-                "date": date_str,
-                "day": day,
-                "shifts": day_shifts,
-                "is_user_squad": is_user_squad,
-                "user_shift_label": user_shift_label,
-            }
-        )
-    # --- Tag holidays on cells (visual-only) ---
-    holiday_map = get_holidays_map(year)  # {'YYYY-MM-DD': 'Holiday Name', ...}
-    for c in cells:
-        if not c:
-            continue
-        name = holiday_map.get(c["date"])
-        if name:
-            c["holiday_name"] = name
-    # --- Tag "today" (visual-only) ---
+    # Whole page: same month + shifts.json version + viewer squad + day → same HTML
     today_str = date.today().isoformat()
-    for c in cells:
-        if not c:
+    shifts_version = _file_version(SHIFTS_FILE)
+    page_key = ("calendar", year, month, shifts_version, user_squad, today_str)
+    html = _view_cache_get(page_key)
+    if html is not None:
+        return html
+
+    # Day cells (padding, dates, shifts, holidays) are memoized per shifts.json
+    # version; only the per-viewer flags are added here, on a copy of each cell
+    cells: List[Optional[Dict[str, Any]]] = []
+    for base in _calendar_base_cells(year, month, shifts_version):
+        if base is None:
+            cells.append(None)
             continue
-        c["is_today"] = (c["date"] == today_str)
-
+        # If viewer has a squad and it’s ON that day, mark highlight
+        label = base["shifts"].get(user_squad) if user_squad else None
+        on = is_on(label)
+        c = dict(base)
+        c["is_user_squad"] = on
+        c["user_shift_label"] = label if on else None
+        c["is_today"] = (c["date"] == today_str)  # visual-only
+        cells.append(c)
 
 
     # Compute prev/next month links
@@ -1079,7 +1500,7 @@ def calendar_view():
     else:
         next_year, next_month = year, month + 1
 
-    return render_template(
+    return _view_cache_put(page_key, render_template(
         "calendar.html",
         year=year,
         month=month,
@@ -1090,12 +1511,45 @@ def calendar_view():
         next_year=next_year,
         next_month=next_month,
         user_squad=user_squad,
-    )
+    ))
 
  
 # =========================
 # Calendar: Day View
 # =========================
+# (source users dict, {squad: [(username, view row), ...]}) — see _squad_index()
+_squad_index_memo: Tuple[Any, Dict[str, List[Tuple[str, Dict[str, Any]]]]] = (None, {})
+
+
+def _squad_index(all_users: Dict[str, Dict[str, Any]]) -> Dict[str, List[Tuple[str, Dict[str, Any]]]]:
+    """
+    Active users bucketed by squad (A..D), in users.json order.
+    Each user comes with a precomputed view row: the profile fields plus
+    `username` and `end_time`, i.e. everything in a roster row that does not
+    depend on the date. Treat rows as read-only (shared across requests).
+    Rebuilt only when `all_users` is a different object, i.e. when the
+    users read cache reloads; pass the dict from load_users_cached().
+    """
+    global _squad_index_memo
+    src, index = _squad_index_memo
+    if src is all_users:
+        return index
+    index = {s: [] for s in ["A", "B", "C", "D"]}
+    for uname, udata in all_users.items():
+        # hide archived users
+        if not is_user_active(udata):
+            continue
+        squad = udata.get("squad")
+        if squad in index:
+            view_row = dict(udata)
+            view_row["username"] = uname
+            # End time from start_time (11h15m later), via the END_TIME table
+            view_row["end_time"] = end_of_shift(udata.get("start_time", "07:00"))
+            index[squad].append((uname, view_row))
+    _squad_index_memo = (all_users, index)
+    return index
+
+
 @app.route("/calendar/<date>")
 def view_day(date: str):
     """
@@ -1112,9 +1566,9 @@ def view_day(date: str):
     """
     # Fresh data pulls
     selected_squad = request.args.get("squad")
-    all_users = load_users()
+    all_users = load_users_cached()
     shifts = load_shifts()
-    status_log = load_status_log()
+    status_log = load_status_log_cached()
 
     # Shifts for the day (default to "Off" for missing squads)
     raw_day = shifts.get(date, {}) or {}
@@ -1144,38 +1598,25 @@ def view_day(date: str):
         else:
             selected_squad = first_on_squad() or ALL_CHOICE
 
-    # Build roster of members for squads that are ON
+    # Build roster of members for squads that are ON (only on-duty squads are
+    # visited; archived users are already excluded from the squad index)
     roster: Dict[str, List[Dict[str, Any]]] = {s: [] for s in ["A", "B", "C", "D"]}
-    for uname, udata in all_users.items():
-        # NEW: hide archived users
-        if not is_user_active(udata):
-            continue
-
-        squad = udata.get("squad")
-        if squad not in VALID_SQUADS:
-            continue
-
+    day_status = status_log.get(date, {})
+    squad_index = _squad_index(all_users)
+    for squad in ["A", "B", "C", "D"]:
         shift_type = day_shifts.get(squad, "Off")
         if not is_on(shift_type):
             continue
 
-        # Compute end time from start_time (11h15m later)
-        start_dt = safe_parse_hhmm(udata.get("start_time", "07:00"), fallback="07:00")
-        end_time = compute_end_time_str(start_dt)
-
-        # Status for this user on this date (e.g., Sick)
-        user_status = status_log.get(date, {}).get(uname, "Available")
-
-        row = dict(udata)
-        row.update(
-            {
-                "username": uname,
+        # Static fields (profile, username, end_time) are prebuilt per user;
+        # only the day-dependent shift_type/status are layered on here
+        members = roster[squad]
+        for uname, view_row in squad_index[squad]:
+            members.append({
+                **view_row,
                 "shift_type": shift_type,
-                "end_time": end_time,
-                "status": user_status,
-            }
-        )
-        roster[squad].append(row)
+                "status": day_status.get(uname, "Available"),  # e.g., Sick
+            })
 
     # Apply squad filter unless "All"
     if selected_squad != ALL_CHOICE:
@@ -1292,7 +1733,7 @@ def my_requests():
         return redirect(url_for("login"))
 
     # --- Load user safely ---
-    all_users = load_users()
+    all_users = load_users_cached()
     user = all_users.get(username)
     if not user:
         flash("User not found. Please log in again.", "error")
@@ -1343,7 +1784,7 @@ def my_requests():
     # Pending vacation (from persistent store and in-memory queue for backward compatibility)
     pending_items = []
     try:
-        pending_items.extend(list_pending())
+        pending_items.extend(e.to_dict() for e in list_pending())
     except Exception:
         # persistent pending store may be unavailable in older deployments
         pass
@@ -1577,58 +2018,62 @@ def landing():
     username = get_current_username()
     if not username:
         return redirect(url_for("login"))
-    all_users = load_users()
+    all_users = load_users_cached()
     user = all_users.get(username)
     if not user:
         return redirect(url_for("login"))
     return render_template("landing.html", user=user)
 
 
+def _secrets_equal(a: str, b: str) -> bool:
+    """Constant-time string compare (UTF-8, so non-ASCII input is fine)."""
+    return secrets.compare_digest(a.encode("utf-8"), b.encode("utf-8"))
+
+
+@lru_cache(maxsize=1)
+def _dummy_password_hash() -> str:
+    """Hash of a random secret in werkzeug's default format (same cost as real
+    hashes). Built on first use so startup does not pay for the key derivation."""
+    return generate_password_hash(secrets.token_hex(16))
+
+
+def _migrate_legacy_password(username: str, password: str) -> None:
+    """Replace a plaintext password with a werkzeug hash and persist at once."""
+    all_users = load_users()  # fresh copy: the cached dict is read-only
+    user = all_users.get(username)
+    if not user:
+        return
+    user["password_hash"] = generate_password_hash(password)
+    user.pop("password", None)
+    # Audit before saving so the event lands in the same write
+    user.setdefault("audit", []).append({
+        "ts": datetime.utcnow().isoformat() + "Z",
+        "actor": username,
+        "action": "password_migrated",
+        "details": {"method": "on_login"}
+    })
+    save_users_atomic(all_users)
+
+
 @app.route("/login", methods=["GET", "POST"])
 def login():
     if request.method == "POST":
         username = request.form.get("username")
         password = request.form.get("password")
-        all_users = load_users()
-        user = all_users.get(username)
+        # Read-only lookup from the users cache; disk is touched only to migrate
+        user = load_users_cached().get(username)
         if user:
-            # Secure password verification (hashed or legacy plaintext with one-time migration)
-            try:
-                from werkzeug.security import check_password_hash, generate_password_hash
-            except Exception:
-                check_password_hash = None
-                generate_password_hash = None
-
             ok = False
             ph = user.get("password_hash")
-            if ph and check_password_hash:
-                # Preferred path: verify against hashed password
-                ok = check_password_hash(ph, password)
+            if ph:
+                # Preferred path: salted hash, verified in constant time by werkzeug
+                ok = check_password_hash(ph, password or "")
             else:
-                # Legacy path: compare plaintext, then migrate to hash on success
-                ok = (user.get("password") == password)
-                if ok and generate_password_hash:
-                    user["password_hash"] = generate_password_hash(password)
-                    user.pop("password", None)
-                    # Persist migration immediately
-                    all_users[username] = user
-                    try:
-                        save_users_atomic(all_users)  # prefer atomic if available
-                    except NameError:
-                        try:
-                            save_users(all_users)       # fallback to non-atomic saver if defined
-                        except NameError:
-                            import os, json
-                            os.makedirs('data', exist_ok=True)
-                            with open(os.path.join('data','users.json'), 'w') as f:
-                                json.dump(all_users, f, indent=2)
-                    # Optional: audit password migration
-                    (user.setdefault("audit", [])).append({
-                        "ts": __import__("datetime").datetime.utcnow().isoformat() + "Z",
-                        "actor": username,
-                        "action": "password_migrated",
-                        "details": {"method": "on_login"}
-                    })
+                # Legacy path: constant-time plaintext compare, then migrate to a hash
+                legacy = user.get("password")
+                ok = bool(legacy) and _secrets_equal(str(legacy), password or "")
+                if ok:
+                    _migrate_legacy_password(username, password)
             # deny if password invalid
             if not ok:
                 return "Invalid username or password", 401
@@ -1644,6 +2089,9 @@ def login():
             session["role"] = role
             return redirect(url_for("landing"))
         else:
+            # Unknown user: burn the same hash work as a wrong password so the
+            # response time does not reveal whether the account exists
+            check_password_hash(_dummy_password_hash(), password or "")
             return "Invalid username or password", 401
     return render_template("login.html")
 
@@ -1675,7 +2123,7 @@ def request_time_off():
 
     # --- Balances for header card ---
     username = session.get("username")
-    all_users = load_users()
+    all_users = load_users_cached()
     u = all_users.get(username, {})
     vacation_left = float(u.get("vacation_left", 0) or 0)
     sick_left = float(u.get("sick_left", 0) or 0)
@@ -1828,32 +2276,38 @@ def submit_request():
             return redirect(url_for("request_time_off"))  # UI will prompt
 
     # --- If here: no duplicates OR user confirmed override ('force') ---
+    sick_left = float(user.get("sick_left", 0) or 0)  # read once: check + running balance
     if request_type == "sick":
         # Sick must have enough hours for *all* selected days
         total_needed = hours * len(requested_dates)
-        if total_needed > float(user.get("sick_left", 0) or 0):
+        if total_needed > sick_left:
             flash("Not enough sick hours remaining for the selected dates.", "error")
             return redirect(url_for("request_time_off"))
 
     # --- Persist per day ---
+    # Profile fields + balances are read once; the loop works on locals
     display_name = f"{user.get('last_name','')} ({user.get('rank','')})"
+    full_name = f"{user.get('first_name','')} {user.get('last_name','')}"
+    call_sign = user.get("call_sign", "")
+    sector = user.get("sector", "")
+    status = "pending" if request_type == "vacation" else "logged"
+    sick_used_ytd = float(user.get("sick_used_ytd", 0) or 0)
     status_log = load_status_log()
     created_count = 0
+    ts_log = datetime.now().strftime("%Y-%m-%d %H:%M:%S")  # one stamp for the whole batch
 
     for d in requested_dates:
-        status = "pending" if request_type == "vacation" else "logged"
-
         # Immutable log append (source of truth for history)
         log_entry = {
             "user": username,
-            "name": f"{user.get('first_name','')} {user.get('last_name','')}",
-            "call_sign": user.get("call_sign", ""),
-            "sector": user.get("sector", ""),
+            "name": full_name,
+            "call_sign": call_sign,
+            "sector": sector,
             "date": d,
             "hours": hours,
             "status": status,
             "handled_by": display_name,
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "timestamp": ts_log,
             "type": request_type,
             "note": note,
         }
@@ -1861,7 +2315,7 @@ def submit_request():
 
         if request_type == "vacation":
             # Vacation is pending approval; balance is adjusted on approval only
-            requests_data.requests.append({
+            requests_data.add_request({
                 "user": username,
                 "date": d,
                 "type": "vacation",
@@ -1872,15 +2326,32 @@ def submit_request():
             })
         else:
             # Sick: deduct immediately and mark the status for that day
-            user["sick_left"] = float(user.get("sick_left", 0) or 0) - hours
-            user["sick_used_ytd"] = float(user.get("sick_used_ytd", 0) or 0) + hours
+            sick_left -= hours
+            sick_used_ytd += hours
             status_log.setdefault(d, {})[username] = "Sick"
 
         created_count += 1
 
-    # Save changes (users + per‑day status overrides)
-    save_users(all_users)
-    save_status_log(status_log)
+    if request_type == "sick":
+        user["sick_left"] = sick_left
+        user["sick_used_ytd"] = sick_used_ytd
+
+    # --- NCCPD AUDIT: record submission summary ---
+    submitted_summary = {
+        "type": request_type,
+        "dates": requested_dates,
+        "hours_per_day": hours,
+        "note": note,
+        "mode": range_mode,
+        "status_effect": ("pending" if request_type == "vacation" else "logged"),
+    }
+    audit_append(all_users, username, "request_submit", submitted_summary, save_immediately=False)
+
+    # Save changes (users + per‑day status overrides) via the background writer;
+    # only sick submissions touch the status log
+    save_users_async(all_users)
+    if request_type == "sick":
+        save_status_log_async(status_log)
 
     # --- Success toasts ---
     if request_type == "vacation":
@@ -1896,17 +2367,6 @@ def submit_request():
             "success",
         )
 
-    # --- NCCPD AUDIT: record submission summary ---
-    submitted_summary = {
-        "type": request_type,
-        "dates": requested_dates,
-        "hours_per_day": hours,
-        "note": note,
-        "mode": range_mode,
-        "status_effect": ("pending" if request_type == "vacation" else "logged"),
-    }
-    audit_append(all_users, username, "request_submit", submitted_summary, save_immediately=True)
-
     return redirect(url_for("landing"))
 
  
@@ -1920,7 +2380,21 @@ def admin_requests():
     Show pending vacation requests grouped by (user, type, hours_per_day) and
     contiguous date ranges. Actions remain per‑day (approve/deny via /handle-request).
     """
-    all_users = load_users()
+    all_users = load_users_cached()
+
+    # Whole page: keyed on the queue version, users.json version and the viewer
+    # (supervisor squad scoping + the per-session CSRF token in the forms)
+    page_key = (
+        "admin_requests",
+        requests_data.version,
+        _file_version(USERS_FILE),
+        session.get("username"),
+        session.get("csrf_token"),
+    )
+    html = _view_cache_get(page_key)
+    if html is not None:
+        return html
+
     pending = list(getattr(requests_data, "requests", []))
 
     # ---- helpers ------------------------------------------------------------
@@ -2017,7 +2491,9 @@ def admin_requests():
         actor_squad = actor.get("squad")
         if actor_squad:
             groups = [g for g in groups if (all_users.get(g.get("user"), {}).get("squad") == actor_squad)]
-    return render_template("admin_requests.html", groups=groups, users=all_users)
+    return _view_cache_put(
+        page_key, render_template("admin_requests.html", groups=groups, users=all_users)
+    )
 
 
 
@@ -2045,56 +2521,58 @@ def handle_request():
             return redirect(url_for("admin_requests"))
 
     handled = False
-    # Find the exact pending vacation request that matches user + date
-    for idx, req in enumerate(list(requests_data.requests)):
-        if (
-            req.get("user") == target
-            and req.get("date") == date_str
-            and req.get("type") == "vacation"
-        ):
-            req["status"] = "approved" if action == "approve" else "denied"
-            target_user = users.get(target)
-            if not target_user:
-                return f"Target user {target} not found", 400
-            hours = float(req.get("hours", 8))
-            if action == "approve":
-                target_user["vacation_left"] = target_user.get("vacation_left", 0) - hours  # deduct on approval only
-                target_user["vacation_used_today"] = target_user.get(
-                    "vacation_used_today", 0
-                ) + hours
-
-            # Audit trail: record the decision in the immutable request log
-            log_entry = {
-                "user": target,
-                "name": f"{target_user.get('first_name','')} {target_user.get('last_name','')}",
-                "call_sign": target_user.get("call_sign", ""),
-                "sector": target_user.get("sector", ""),
+    # Find the exact pending vacation request that matches user + date (indexed lookup)
+    req = requests_data.find_request(target, date_str, "vacation")
+    if req is not None:
+        decision = "approved" if action == "approve" else "denied"
+        target_user = users.get(target)
+        if not target_user:
+            return f"Target user {target} not found", 400
+        # Set only once the request will actually be removed (keeps
+        # requests_data.version in step with what admin_requests shows)
+        req["status"] = decision
+        hours = float(req.get("hours", 8))
+        if action == "approve":
+            # deduct on approval only
+            target_user["vacation_left"] = target_user.get("vacation_left", 0) - hours
+            target_user["vacation_used_today"] = target_user.get("vacation_used_today", 0) + hours
+
+        # Read each profile field once; the log entry and audit reuse the locals
+        get_t = target_user.get
+        admin_last = admin_user.get("last_name", "")
+
+        # Audit trail: record the decision in the immutable request log
+        log_entry = {
+            "user": target,
+            "name": f"{get_t('first_name','')} {get_t('last_name','')}",
+            "call_sign": get_t("call_sign", ""),
+            "sector": get_t("sector", ""),
+            "date": date_str,
+            "hours": hours,
+            "status": decision,
+            "handled_by": f"{admin_last} ({admin_user.get('rank','')})",
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "type": "vacation",
+        }
+        log_request(log_entry)
+        # --- NCCPD AUDIT: record decision for this date ---
+        audit_append(
+            users,
+            target,
+            "vacation_decision",
+            {
                 "date": date_str,
                 "hours": hours,
-                "status": req["status"],
-                "handled_by": f"{admin_user.get('last_name','')} ({admin_user.get('rank','')})",
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "type": "vacation",
-            }
-            log_request(log_entry)
-            # --- NCCPD AUDIT: record decision for this date ---
-            audit_append(
-                users,
-                target,
-                "vacation_decision",
-                {
-                    "date": date_str,
-                    "hours": hours,
-                    "decision": req["status"],      # 'approved' or 'denied'
-                    "by": admin_user.get("last_name", "") or username,
-                },
-                save_immediately=True,
-            )
+                "decision": decision,      # 'approved' or 'denied'
+                "by": admin_last or username,
+            },
+            save_immediately=False,
+        )
 
-            save_users(users)
-            del requests_data.requests[idx]
-            handled = True
-            break
+        # Balance change + audit leave in one queued write (see write-behind notes)
+        save_users_async(users)
+        requests_data.remove_request(req)
+        handled = True
 
     if not handled:
         flash("No matching pending request found or already handled.")
@@ -2106,7 +2584,6 @@ def handle_request():
 def admin_history():
     if "username" not in session:
         return redirect(url_for("login"))
-    log_data = get_request_log()
     # --- Filters (admin history): date range, user, status, type ---
     q_user = (request.args.get("user") or "").strip()
     q_status = (request.args.get("status") or "").strip().lower()  # approved|denied|logged|cancelled
@@ -2125,26 +2602,25 @@ def admin_history():
             return False
         return True
 
-    filtered_log = []
-    for e in log_data:
-        # Only show decisions/logs that are meaningful to admins by default
-        st = (e.get("status") or "").lower()
-        tp = (e.get("type") or "").lower()
-        if q_status and st != q_status:
-            continue
-        if q_type and tp != q_type:
-            continue
-        if q_user and (e.get("user") != q_user):
-            continue
-        ds = e.get("date") or ""
-        if (q_from or q_to) and (not _in_range(ds)):
-            continue
-        filtered_log.append(e)
+    def _filtered():
+        # Generator: the template's {% for %} pulls rows one at a time, so no
+        # copy of the log and no filtered list is ever materialized.
+        # type/status are stored lowercase (request_log normalizes on write).
+        for e in iter_request_log():
+            if q_status and e.get("status") != q_status:
+                continue
+            if q_type and e.get("type") != q_type:
+                continue
+            if q_user and (e.get("user") != q_user):
+                continue
+            if (q_from or q_to) and (not _in_range(e.get("date") or "")):
+                continue
+            yield e
     # Provide users map and echo filters back to template for form stickiness
-    users_map = load_users()
+    users_map = load_users_cached()
     return render_template(
         "admin_history.html",
-        request_log=filtered_log,
+        request_log=_filtered(),
         users=users_map,
         q_user=q_user,
         q_status=q_status,
@@ -2223,8 +2699,7 @@ def admin_tow_log():
 def admin_sick_history():
     if "username" not in session:
         return redirect(url_for("login"))
-    log_data = get_request_log()
-    sick_log = [e for e in log_data if e.get("type") == "sick" and e.get("status") == "logged"]
+    sick_log = (e for e in iter_request_log() if e.get("type") == "sick" and e.get("status") == "logged")
     return render_template("admin_history.html", request_log=sick_log)
 
 
@@ -2417,10 +2892,11 @@ def edit_user(username: str):
 
     if request.method == "POST":
         before = dict(user)  # shallow snapshot before changes
+        form = request.form
         for field in list(user.keys()):
-            if field not in request.form:
+            raw = form.get(field)  # one lookup: None means "not in form"
+            if raw is None:
                 continue
-            raw = request.form.get(field, "")
 
             if field in list_fields:
                 user[field] = [s.strip() for s in raw.split(",") if s.strip()]
@@ -2437,9 +2913,9 @@ def edit_user(username: str):
                     user[field] = raw
 
         # Optional: normalize date for seniority_date (store raw YYYY-MM-DD; validate elsewhere)
-        if "seniority_date" in request.form:
-            sd_raw = (request.form.get("seniority_date", "") or "").strip()
-            user["seniority_date"] = sd_raw
+        sd_raw = form.get("seniority_date")
+        if sd_raw is not None:
+            user["seniority_date"] = sd_raw.strip()
 
         save_users(all_users)
         # --- NCCPD AUDIT: profile update (only log actual changes) ---
@@ -2480,6 +2956,14 @@ def edit_user(username: str):
 # =========================
 # Admin: Manage Users (bulk)
 # =========================
+def _form_str(form, form_key: str, record: Dict[str, Any], field: str) -> str:
+    """Stripped `form[form_key]`; falls back to `record[field]` only when the form omits it."""
+    raw = form.get(form_key)
+    if raw is None:
+        raw = record.get(field, "")
+    return (raw or "").strip()
+
+
 @app.route("/admin/manage-users", methods=["GET", "POST"], endpoint="manage_users")
 @require_role("admin", "webmaster")
 def manage_users():
@@ -2488,21 +2972,22 @@ def manage_users():
     if request.method == "POST":
         # Apply bulk edits; sanitize inputs and normalize blank/"None" squads
         valid_squads = VALID_SQUADS | {"None", ""}
+        form = request.form
         for uname, u in all_users.items():
-            form_squad = (request.form.get(f"squad[{uname}]", u.get("squad", "")) or "").strip()
+            form_squad = _form_str(form, f"squad[{uname}]", u, "squad")
             if form_squad not in valid_squads:
                 form_squad = "None"
             u["squad"] = "" if form_squad in ("None", "") else form_squad
 
-            u["rank"] = (request.form.get(f"rank[{uname}]", u.get("rank", "")) or "").strip()
-            u["call_sign"] = (request.form.get(f"call_sign[{uname}]", u.get("call_sign", "")) or "").strip()
-            u["sector"] = (request.form.get(f"sector[{uname}]", u.get("sector", "")) or "").strip()
+            u["rank"] = _form_str(form, f"rank[{uname}]", u, "rank")
+            u["call_sign"] = _form_str(form, f"call_sign[{uname}]", u, "call_sign")
+            u["sector"] = _form_str(form, f"sector[{uname}]", u, "sector")
 
-            form_skills = request.form.get(f"skills[{uname}]", "")
+            form_skills = form.get(f"skills[{uname}]", "")
             u["skills"] = [s.strip() for s in (form_skills or "").split(",") if s.strip()]
 
             # NEW: allow bulk toggle of is_active if you add checkboxes in the template (optional)
-            active_val = request.form.get(f"is_active[{uname}]")
+            active_val = form.get(f"is_active[{uname}]")
             if active_val is not None:
                 u["is_active"] = active_val in {"on", "true", "1", "yes"}
 
@@ -2651,6 +3136,29 @@ def toggle_bidding():
 # =========================
 # NCCPD ONLY: Training Day (Supervisor Tab Placeholder)
 # =========================
+@lru_cache(maxsize=32)
+def _training_officers(scope_squad: Optional[str], users_version: Tuple[int, int, int]):
+    """
+    Officer picker for the training-day form, memoized per users.json version.
+    - scope_squad: supervisor's squad, or None for Admin/Webmaster (all active users)
+    - users_version: `_file_version(USERS_FILE)`; a new version is a cache miss
+    Returns (officers sorted by name, frozenset of allowed usernames).
+    Results are shared between requests; callers must not mutate them.
+    """
+    all_users = load_users_cached()
+    officers = [
+        {
+            "username": uname,
+            "name": f"{u.get('last_name','')}, {u.get('first_name','')}",
+            "squad": u.get("squad"),
+        }
+        for uname, u in all_users.items()
+        if is_user_active(u) and (scope_squad is None or u.get("squad") == scope_squad)
+    ]
+    officers.sort(key=lambda x: x["name"].lower())
+    return tuple(officers), frozenset(o["username"] for o in officers)
+
+
 @app.route("/admin/training-day", methods=["GET", "POST"], endpoint="training_day_create")
 @require_role("supervisor", "admin", "webmaster")
 def training_day_create():
@@ -2659,32 +3167,16 @@ def training_day_create():
     - Supervisors: see only officers in their own squad.
     - Admin/Webmaster: see all active users.
     """
-    all_users = load_users()
+    # Shared read-only cache for the actor, picker and display sort; only the
+    # POST branch (which mutates and saves) pays for a fresh parse
+    all_users = load_users_cached()
     actor = all_users.get(session.get("username"), {})
     role = actor.get("role")
     actor_squad = actor.get("squad")
 
-    def _is_active(u: dict) -> bool:
-        return bool(u.get("is_active", True))
-
-    def _same_squad(u: dict) -> bool:
-        return u.get("squad") == actor_squad
-
-    # Build officer list based on role
-    if role == "supervisor" and actor_squad:
-        pool = {k: v for k, v in all_users.items() if _is_active(v) and _same_squad(v)}
-    else:
-        pool = {k: v for k, v in all_users.items() if _is_active(v)}
-
-    officers = [
-        {
-            "username": uname,
-            "name": f"{u.get('last_name','')}, {u.get('first_name','')}",
-            "squad": u.get("squad"),
-        }
-        for uname, u in pool.items()
-    ]
-    officers.sort(key=lambda x: x["name"].lower())
+    # Officer list based on role (supervisors: own squad only); memoized per users.json version
+    scope_squad = actor_squad if (role == "supervisor" and actor_squad) else None
+    officers, allowed = _training_officers(scope_squad, _file_version(USERS_FILE))
 
     # --- POST: create training day entries (single date, multiple officers) ---
     if request.method == "POST":
@@ -2701,55 +3193,53 @@ def training_day_create():
             flash("Please select at least one officer.", "error")
             return redirect(url_for("training_day_create"))
 
-        # Enforce squad scope for supervisors via `pool`
-        allowed = set((pool or {}).keys())
+        # Enforce squad scope for supervisors via `allowed`
         filtered = [u for u in sel_officers if u in allowed] if allowed else sel_officers
         filtered_out = [u for u in sel_officers if u not in allowed] if allowed else []
         if not filtered:
             flash("No valid officers selected for your scope.", "error")
             return redirect(url_for("training_day_create"))
 
-        # Load existing entries; de-duplicate by (date, officer)
+        # Fresh copy: audit entries are appended to the target users below
+        all_users = load_users()
+
+        # Load existing entries (keyed by id); de-duplicate by (date, officer)
         entries = load_training_days()
-        existing_keys = { (e.get("date"), e.get("officer")) for e in entries }
 
-        created = 0
-        skipped = 0
-        ts = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+        # Stamp once per request; every entry in this batch shares it
+        ts_iso = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
         actor_uname = session.get("username") or "system"
 
-        for uname in filtered:
-            key = (date_str, uname)
-            if key in existing_keys:
-                skipped += 1
-                continue
-            target = all_users.get(uname, {})
-            entry = {
-                "id": f"td_{date_str}_{uname}",
+        # Officers not yet assigned on this date (order kept, repeats collapsed)
+        to_create = list(dict.fromkeys(
+            u for u in filtered if training_day_id(date_str, u) not in entries
+        ))
+        skipped = len(filtered) - len(to_create)
+        created = len(to_create)
+
+        squads = {u: all_users.get(u, {}).get("squad") for u in to_create}
+        entries.update({
+            training_day_id(date_str, u): {
+                "id": training_day_id(date_str, u),
                 "date": date_str,
-                "officer": uname,
+                "officer": u,
                 "notes": notes,
-                "squad": target.get("squad"),
+                "squad": squads[u],
                 "created_by": actor_uname,
-                "created_at": ts,
-                "updated_at": ts,
+                "created_at": ts_iso,
+                "updated_at": ts_iso,
             }
-            entries.append(entry)
-            existing_keys.add(key)
-            created += 1
+            for u in to_create
+        })
 
-            # Audit on the target user's record (best-effort)
-            try:
-                audit_append(all_users, uname, "training_day_create", {
-                    "date": date_str,
-                    "notes": notes,
-                    "squad": target.get("squad"),
-                }, save_immediately=False)
-            except Exception:
-                pass
+        # Audit on each target user's record (saved with the batch below)
+        audit_append_bulk(all_users, [
+            (u, "training_day_create", {"date": date_str, "notes": notes, "squad": squads[u]})
+            for u in to_create
+        ], save_immediately=False)
 
-        save_training_days(entries)
-        save_users(all_users)
+        save_training_days_async(entries)
+        save_users_async(all_users)
 
         msg = f"Created {created} training assignment(s)."
         if skipped:
@@ -2759,126 +3249,32 @@ def training_day_create():
         flash(msg, "success" if created else "warning")
         return redirect(url_for("training_day_create"))
 
-    # Load existing entries & apply squad scoping for display
-    entries = load_training_days()
+    # --- Load entries for display (squad-scoped for supervisors) ---
+    entries = load_training_days().values()
 
-    def _by_date_desc_then_name(e):
-        ds = e.get("date", "")
-        try:
-            k1 = datetime.strptime(ds, "%Y-%m-%d")
-        except Exception:
-            k1 = datetime.min
+    def _name_key(e):
+        # last, first for stable officer ordering
         u = all_users.get(e.get("officer"), {})
-        lname = (u.get("last_name", "") or "").lower()
-        fname = (u.get("first_name", "") or "").lower()
-        return (-k1.timestamp(), lname, fname)
-
-    if role == "supervisor" and actor_squad:
-        entries = [e for e in entries if e.get("squad") == actor_squad]
-    try:
-        entries = sorted(entries, key=_by_date_desc_then_name)
-    except Exception:
-        pass
-                # --- POST: create training day entries (one date, multiple officers) ---
-    if request.method == "POST":
-        sel_officers = request.form.getlist("officers")
-        date_str = (request.form.get("date") or "").strip()
-        notes = (request.form.get("notes") or "").strip()
+        return f"{u.get('last_name','')},{u.get('first_name','')}".lower()
 
-        # Basic validation
-        day = _parse_iso_date(date_str)
-        if not day:
-            flash("Please provide a valid date.", "error")
-            return redirect(url_for("training_day_create"))
-        if not sel_officers:
-            flash("Please select at least one officer.", "error")
-            return redirect(url_for("training_day_create"))
-
-        # Build allowed officer pool based on role/squad
-        entries = load_training_days()
-        allowed_usernames = set()
-        all_users = load_users()
-        if role == "supervisor" and actor_squad:
-            for uname, u in all_users.items():
-                if u.get("is_active", True) and u.get("squad") == actor_squad:
-                    allowed_usernames.add(uname)
-        else:
-            for uname, u in all_users.items():
-                if u.get("is_active", True):
-                    allowed_usernames.add(uname)
-
-        filtered = [u for u in sel_officers if u in allowed_usernames]
-        filtered_out = [u for u in sel_officers if u not in allowed_usernames]
-        if not filtered:
-            flash("No valid officers selected for your scope.", "error")
-            return redirect(url_for("training_day_create"))
-
-        existing_keys = {(e.get("date"), e.get("officer")) for e in entries}
-        created = 0
-        skipped = 0
-        ts = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
-        actor_uname = session.get("username") or "system"
-
-        for uname in filtered:
-            key = (date_str, uname)
-            if key in existing_keys:
-                skipped += 1
-                continue
-            target = all_users.get(uname, {})
-            entry = {
-                "id": f"td_{date_str}_{uname}",
-                "date": date_str,
-                "officer": uname,
-                "notes": notes,
-                "squad": target.get("squad"),
-                "created_by": actor_uname,
-                "created_at": ts,
-                "updated_at": ts,
-            }
-            entries.append(entry)
-            existing_keys.add(key)
-            created += 1
-
-            # Best-effort audit append on the officer record
-            try:
-                audit_append(all_users, uname, "training_day_create", {
-                    "date": date_str,
-                    "notes": notes,
-                    "squad": target.get("squad"),
-                }, save_immediately=False)
-            except Exception:
-                pass
-
-        save_training_days(entries)
-        save_users(all_users)
-
-        msg = f"Created {created} training assignment(s)."
-        if skipped:
-            msg += f" Skipped {skipped} duplicate(s)."
-        if filtered_out:
-            msg += f" Ignored {len(filtered_out)} out-of-scope selection(s)."
-        flash(msg, "success" if created else "warning")
-        return redirect(url_for("training_day_create"))
+    def _date_key(e):
+        # YYYY-MM-DD compares correctly as a string; malformed dates map to ""
+        # so they sink below every real date in the descending pass
+        ds = e.get("date") or ""
+        if len(ds) == 10 and ds[4] == "-" and ds[7] == "-":
+            return ds
+        return ""
+
+    # Newest date first, then officer name: two stable passes (name asc, then
+    # date desc) avoid parsing every date just to negate a timestamp.
+    # Squad scoping feeds the sort directly (no intermediate filtered list).
+    scoped = role == "supervisor" and actor_squad
+    entries = sorted(
+        (e for e in entries if not scoped or e.get("squad") == actor_squad),
+        key=_name_key,
+    )
+    entries.sort(key=_date_key, reverse=True)
 
-    # --- Load entries for display (squad-scoped for supervisors) ---
-    entries = load_training_days()
-    try:
-        def _key_sort(e):
-            ds = e.get("date", "")
-            try:
-                t = datetime.strptime(ds, "%Y-%m-%d").timestamp()
-            except Exception:
-                t = 0
-            # last, first for stable officer ordering
-            u = all_users.get(e.get("officer"), {}) if 'all_users' in locals() else load_users().get(e.get("officer"), {})
-            name_key = f"{u.get('last_name','')},{u.get('first_name','')}".lower()
-            return (-t, name_key)
-        if role == "supervisor" and actor_squad:
-            entries = [e for e in entries if e.get("squad") == actor_squad]
-        entries = sorted(entries, key=_key_sort)
-    except Exception:
-        pass
-    
     return render_template(
         "training_day_create.html",
         officers=officers,
@@ -2906,11 +3302,7 @@ def training_day_delete():
     officer = (request.form.get("officer") or "").strip()
 
     entries = load_training_days()
-
-    def _matches(e):
-        if entry_id:
-            return e.get("id") == entry_id
-        return (e.get("date") == date_str) and (e.get("officer") == officer)
+    td_id = entry_id or training_day_id(date_str, officer)
 
     # Enforce supervisor scope
     def _allowed(e):
@@ -2918,16 +3310,14 @@ def training_day_delete():
             return e.get("squad") == actor_squad
         return True
 
-    new_entries = []
     removed = 0
-    for e in entries:
-        if _matches(e) and _allowed(e):
-            removed += 1
-            continue
-        new_entries.append(e)
+    e = entries.get(td_id)
+    if e is not None and _allowed(e):
+        entries.pop(td_id, None)
+        removed = 1
 
     if removed:
-        save_training_days(new_entries)
+        save_training_days(entries)
         flash(f"Deleted {removed} training assignment(s).", "success")
     else:
         flash("No matching entry found or not permitted.", "warning")
@@ -2973,7 +3363,7 @@ def nccpd_run_accrual():
 
         total += 1
 
-    save_users(users)
+    save_users_async(users)
 
     if flagged > 0:
         flash(f"NCCPD accrual complete for {total} users. {flagged} require supervisor attention (over-cap).", "warning")
@@ -2999,32 +3389,23 @@ def cancel_request():
         return redirect(url_for("login"))
 
     date_str = (request.form.get("date") or "").strip()
+    ts = datetime.now()
+    ts_log = ts.strftime("%Y-%m-%d %H:%M:%S")
 
-    # Find the matching pending vacation request for this user/date
-    found_idx = None
-    hours_val = 0.0
-    note_val = ""
-    for idx, req in enumerate(list(requests_data.requests)):
-        if (
-            req.get("user") == username
-            and (req.get("type") or "").lower() == "vacation"
-            and (req.get("status") or "").lower() == "pending"
-            and (req.get("date") or "") == date_str
-        ):
-            found_idx = idx
-            try:
-                hours_val = float(req.get("hours", 0) or 0)
-            except (TypeError, ValueError):
-                hours_val = 0.0
-            note_val = req.get("note", "")
-            break
-
-    if found_idx is None:
+    # Find the matching pending vacation request for this user/date (indexed lookup;
+    # type/status are stored lowercase, see requests_data, so compare directly)
+    req = requests_data.find_request(username, date_str, "vacation")
+    if req is None or req.get("status") != "pending":
         flash("No matching pending vacation request to cancel.", "warning")
         return redirect(url_for("my_requests"))
+    try:
+        hours_val = float(req.get("hours", 0) or 0)
+    except (TypeError, ValueError):
+        hours_val = 0.0
+    note_val = req.get("note", "")
 
     # Remove from the pending queue
-    del requests_data.requests[found_idx]
+    requests_data.remove_request(req)
     # --- NCCPD AUDIT: user-initiated cancel of a pending request ---
     users = load_users()
     audit_append(
@@ -3047,7 +3428,7 @@ def cancel_request():
         "hours": hours_val,
         "status": "cancelled",     # <- key change
         "handled_by": display_name,  # who initiated the action (user display)
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "timestamp": ts_log,
         "type": "vacation",
         "note": note_val,
     }
@@ -3112,6 +3493,22 @@ def archive_user():
 # =============================================
 # CSRF: decorator and token bootstrap
 # =============================================
+def _csrf_tokens_match(sent: str, want: str) -> bool:
+    """
+    Constant-time compare of the submitted token against the session token.
+    Session tokens are hex (ASCII), so both sides are encoded once and compared
+    as bytes; a non-ASCII submission can never match and is rejected outright.
+    """
+    if not sent or not want:
+        return False
+    try:
+        sent_b = sent.encode("ascii")
+        want_b = want.encode("ascii")
+    except UnicodeEncodeError:
+        return False
+    return secrets.compare_digest(sent_b, want_b)
+
+
 def require_csrf(view_fn):
     """
     Lightweight CSRF decorator used for canary routes.
@@ -3125,7 +3522,7 @@ def require_csrf(view_fn):
             sent = (request.form.get('_csrf') or request.headers.get('X-CSRF-Token') or '').strip()
             want = session.get('csrf_token') or ''
             # Use constant-time compare to avoid timing leaks
-            if not sent or not want or not secrets.compare_digest(sent, want):
+            if not _csrf_tokens_match(sent, want):
                 return 'CSRF token missing or invalid', 400
         return view_fn(*args, **kwargs)
     return _wrapped
@@ -3137,6 +3534,8 @@ def _ensure_csrf_token():
     Ensure every session has a CSRF token.
     (Idempotent; safe to call on every request.)
     """
+    if _is_static_request():
+        return  # null session; nothing to seed
     try:
         if 'csrf_token' not in session:
             # 32 hex bytes = 64 chars; plenty of entropy for a per-session token
@@ -3190,7 +3589,7 @@ def _csrf_global_enforcer():
     # Pull submitted token from form or header and compare to session token
     sent = (request.form.get('_csrf') or request.headers.get('X-CSRF-Token') or '').strip()
     want = session.get('csrf_token') or ''
-    if not sent or not want or not secrets.compare_digest(sent, want):
+    if not _csrf_tokens_match(sent, want):
         return 'CSRF token missing or invalid', 400
 if __name__ == "__main__":
     app.run(debug=True)
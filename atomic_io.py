@@ -0,0 +1,261 @@
+"""
+Shared I/O helpers for the JSON / JSON Lines stores: one JSON codec and one
+durable-write path.
+
+`dumps_indent()` / `dumps_line()` / `loads()` use orjson when installed and
+stdlib json otherwise, with the same options everywhere (2-space indent for
+the stores, non-str dict keys coerced to strings like json.dumps does).
+
+Every store (users.json via app.py, pending.json, request_log.jsonl, the
+fix_users.py maintenance script) writes through here so they all get the same
+guarantee:
+
+    write temp sibling -> fsync(temp) -> os.replace(temp, target) -> fsync(dir)
+
+Readers never observe a half-written file, and a crash or power loss can
+neither leave a renamed-but-empty file nor lose the rename itself.
+`flock_path()` serializes read-modify-write cycles across worker processes.
+"""
+
+# =============================================================================
+# MAINTAINER NOTES
+# -----------------------------------------------------------------------------
+# - Standard library only; orjson is an optional speed-up. Linux-only extras
+#   (O_TMPFILE, linkat) are probed at import time and skipped elsewhere.
+# - Errors are NOT swallowed here: callers decide whether a failed write is
+#   fatal (scripts) or logged and ignored (the web app's best-effort stores).
+# - Temp files live next to the target (same filesystem, so the replace is
+#   atomic) and are named ".<target name>-<random>.tmp".
+# =============================================================================
+
+from __future__ import annotations
+import json
+import os
+import secrets
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Any, Iterator, Union
+
+try:  # optional: C JSON codec, serializes straight to bytes
+    import orjson
+except ImportError:
+    orjson = None
+
+# Callers that can hand the parser a zero-copy buffer (mmap) check this first
+HAVE_ORJSON = orjson is not None
+
+try:  # POSIX advisory locks (see flock_path); missing on Windows
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# O_TMPFILE files are published with linkat(..., AT_SYMLINK_FOLLOW) (Linux only;
+# see _link_fd). os.link() issues that call only when given a src_dir_fd.
+_USE_TMPFILE = (
+    hasattr(os, "O_TMPFILE")
+    and os.link in os.supports_dir_fd
+    and os.link in os.supports_follow_symlinks
+)
+
+
+# -----------------------------------------------------------------------------
+# JSON codec
+# -----------------------------------------------------------------------------
+def dumps_indent(obj: Any) -> bytes:
+    """2-space-indented UTF-8 JSON, the on-disk format of the JSON stores."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def dumps_line(obj: Any) -> bytes:
+    """Compact UTF-8 JSON plus a newline: one JSON Lines record."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def loads(raw: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """Parse JSON. Decode errors raise ValueError (json.JSONDecodeError and
+    orjson.JSONDecodeError both subclass it)."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    if isinstance(raw, memoryview):
+        raw = raw.tobytes()  # stdlib json cannot read buffers directly
+    return json.loads(raw)
+
+
+# -----------------------------------------------------------------------------
+# Durable writes
+# -----------------------------------------------------------------------------
+def fsync_dir(d: str) -> None:
+    """Flush directory metadata (the rename) to disk; no-op where unsupported."""
+    try:
+        dir_fd = os.open(d, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    except OSError:
+        return  # e.g. Windows: directories cannot be opened this way
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+def _write_fd(fd: int, data: bytes) -> None:
+    """Write all of `data` to a raw descriptor: one os.write() for regular files,
+    looping only if the kernel reports a short write."""
+    view = memoryview(data)
+    while view:
+        n = os.write(fd, view)
+        view = view[n:]
+
+
+def _copy_mode(fd: int, path: str) -> None:
+    """Give the temp file the target's permission bits, so a rewrite never
+    changes who can read the store. New targets keep the temp file's 0600."""
+    try:
+        os.fchmod(fd, os.stat(path).st_mode & 0o7777)
+    except (OSError, AttributeError):  # no target yet / no fchmod (Windows)
+        pass
+
+
+def _link_fd(fd: int, dir_fd: int, name: str) -> None:
+    """Give the nameless O_TMPFILE inode behind `fd` the name `name` in `dir_fd`.
+    Plain link(2) refuses /proc/self/fd magic links (EXDEV); passing src_dir_fd
+    makes CPython use linkat(2), which follows them."""
+    os.link("/proc/self/fd/%d" % fd, name, src_dir_fd=dir_fd, dst_dir_fd=dir_fd,
+            follow_symlinks=True)
+
+
+def _tmp_prefix(path: str) -> str:
+    return "." + os.path.basename(path) + "-"
+
+
+def _write_tmp(path: str, d: str, data: bytes) -> str:
+    """Write `data` to a complete, fsynced temp file in directory `d`; return its path.
+
+    Linux: the file is opened with O_TMPFILE (an inode with no name), written and
+    fsynced, and only then linked into `d`, so a crash mid-write leaves no stray
+    temp file behind. Falls back to tempfile.mkstemp() where O_TMPFILE or /proc
+    is unavailable (other OSes, some filesystems/containers).
+    """
+    if _USE_TMPFILE:
+        try:
+            dir_fd = os.open(d, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            dir_fd = None
+        fd = None
+        if dir_fd is not None:
+            try:
+                fd = os.open(".", os.O_TMPFILE | os.O_WRONLY, 0o600, dir_fd=dir_fd)  # same mode as mkstemp
+            except OSError:
+                pass  # filesystem without O_TMPFILE support
+        try:
+            if fd is not None:
+                _copy_mode(fd, path)
+                _write_fd(fd, data)
+                os.fsync(fd)
+                name = "%s%s.tmp" % (_tmp_prefix(path), secrets.token_hex(8))
+                _link_fd(fd, dir_fd, name)
+                return os.path.join(d, name)
+        except OSError:
+            pass  # e.g. /proc not mounted; retry the portable way below
+        finally:
+            if fd is not None:
+                os.close(fd)
+            if dir_fd is not None:
+                os.close(dir_fd)
+
+    # Portable path: named temp file from the start
+    fd, tmp = tempfile.mkstemp(dir=d, prefix=_tmp_prefix(path), suffix=".tmp")
+    try:
+        try:
+            _copy_mode(fd, path)
+            _write_fd(fd, data)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return tmp
+
+
+def _publish(tmp: str, path: str, d: str) -> None:
+    """Rename the fsynced `tmp` over `path`, then persist the rename.
+    Removes `tmp` if the replace itself fails."""
+    try:
+        os.replace(tmp, path)  # atomic on POSIX/modern Windows
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    fsync_dir(d)
+
+
+def atomic_write_bytes(path: str, data: bytes) -> None:
+    """Durably replace `path` with `data` (temp + fsync + replace + dir fsync).
+    Raises OSError on failure; the old file is then left untouched."""
+    d = os.path.dirname(os.path.abspath(path)) or "."
+    _publish(_write_tmp(path, d, data), path, d)
+
+
+@contextmanager
+def atomic_open(path: str, buffering: int = -1) -> Iterator[IO[bytes]]:
+    """Binary file object whose contents replace `path` when the block exits.
+
+        with atomic_open("log.jsonl", buffering=1 << 20) as f:
+            for line in lines:
+                f.write(line)
+
+    For writers that stream many pieces and should not build the whole payload
+    first. Same guarantees as atomic_write_bytes(); if the block raises, the
+    temp file is removed and `path` is untouched. Always a named temp file:
+    O_TMPFILE's fallback would need the data a second time.
+    """
+    d = os.path.dirname(os.path.abspath(path)) or "."
+    fd, tmp = tempfile.mkstemp(dir=d, prefix=_tmp_prefix(path), suffix=".tmp")
+    try:
+        _copy_mode(fd, path)
+        with os.fdopen(fd, "wb", buffering=buffering) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())  # contents on disk before the rename exposes them
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    _publish(tmp, path, d)
+
+
+@contextmanager
+def flock_path(path: str) -> Iterator[None]:
+    """Hold an exclusive flock() on `path` (created empty if missing) for the block.
+
+    Serializes read-modify-write cycles across threads and worker processes:
+    each call opens its own descriptor, so two holders always exclude each
+    other -- which also means it is not reentrant. Best-effort: without fcntl
+    (Windows) or if the lock file cannot be opened, the block runs unlocked.
+    """
+    lf = None
+    if fcntl is not None:
+        try:
+            lf = open(path, "a")
+        except OSError:
+            lf = None
+    if lf is None:
+        yield
+        return
+    try:
+        fcntl.flock(lf.fileno(), fcntl.LOCK_EX)
+        yield
+    finally:
+        lf.close()  # closing the descriptor releases the lock
@@ -8,11 +8,16 @@ Adds a yearly "sick_used_ytd" counter if missing and removes deprecated daily co
 # ------------------------------
 from __future__ import annotations  # enables forward references in type hints (safe for 3.7+)
 import argparse                     # parses command-line flags/options for flexible usage
-import json                         # read/write JSON files (our simple datastore format)
-import os                           # used for atomic replace and file operations
+import shutil                       # kernel-side file copy for backups
 from pathlib import Path            # robust filesystem paths (works cross-platform)
 from typing import Dict, Any, Tuple # type hints for clarity and tooling
 
+# ------------------------------
+# Local imports
+# ------------------------------
+# Shared with the app: JSON codec (orjson when installed) + temp/fsync/replace/dir-fsync writes
+from atomic_io import atomic_write_bytes, dumps_indent, loads
+
 
 # ------------------------------
 # Constants & Defaults
@@ -37,26 +42,20 @@ def load_users(path: Path) -> Dict[str, Dict[str, Any]]:
     Returns:
         Dict mapping username -> user record (dict of fields)
     """
-    # Open the file in text mode with explicit UTF-8 encoding for portability
-    with path.open("r", encoding="utf-8") as f:  # file handle is closed automatically by context manager
-        return json.load(f)                      # parse JSON into Python dict
+    # Read raw UTF-8 bytes and parse with the shared codec (same one the app uses)
+    return loads(path.read_bytes())
 
 
 def atomic_write_json(path: Path, data: Any) -> None:
     """
     Write JSON data atomically: write to a temporary file and replace the target.
 
-    This prevents corruption if the process crashes mid-write.
+    This prevents corruption if the process crashes mid-write; the temp file and
+    the directory entry are fsynced so the result also survives power loss.
     """
-    # Create a temp file path in the same directory to ensure os.replace is atomic on the same filesystem
-    tmp_path = path.with_suffix(path.suffix + ".tmp")  # e.g., users.json.tmp
-
-    # Write the JSON payload to the temp file with pretty indentation
-    with tmp_path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)  # human-friendly formatting for diffs/reviews
-
-    # Atomically replace target with temp (no partial writes)
-    os.replace(str(tmp_path), str(path))  # os.replace is atomic on POSIX and Windows
+    # Serialize once to UTF-8 bytes with pretty indentation (human-friendly for diffs/reviews),
+    # then temp sibling -> fsync -> os.replace -> fsync(dir); same helpers the app uses
+    atomic_write_bytes(str(path), dumps_indent(data))
 
 
 def backup_file(path: Path) -> Path:
@@ -69,9 +68,8 @@ def backup_file(path: Path) -> Path:
     # Define backup path with .bak extension alongside original file
     backup_path = path.with_suffix(path.suffix + ".bak")  # e.g., users.json.bak
 
-    # Copy bytes from source to backup using read/write (avoid external deps)
-    with path.open("rb") as src, backup_path.open("wb") as dst:
-        dst.write(src.read())  # simple copy; acceptable for small JSON stores
+    # Copy contents only; on Linux this uses sendfile() so data never passes through userspace
+    shutil.copyfile(str(path), str(backup_path))
 
     return backup_path
 
@@ -112,7 +110,10 @@ def update_user_record(user: Dict[str, Any]) -> Tuple[bool, bool]:
 
 def migrate_users(users: Dict[str, Dict[str, Any]]) -> Tuple[int, int]:
     """
-    Apply update_user_record to all users and count changes.
+    Apply the update_user_record mutations to all users and count changes.
+
+    The mutations are inlined here (same rules as update_user_record) so a
+    large user map pays for one loop, not a call + tuple per user.
 
     Returns:
       (count_added_ytd, count_removed_today)
@@ -121,13 +122,15 @@ def migrate_users(users: Dict[str, Dict[str, Any]]) -> Tuple[int, int]:
     added_total = 0     # how many users got sick_used_ytd added
     removed_total = 0   # how many users had sick_used_today removed
 
-    # Iterate each username and their mutable user record
-    for _, user_data in users.items():
-        added, removed = update_user_record(user_data)  # mutate in place
-        # Increment counters based on flags returned
-        if added:
+    # Iterate each mutable user record (usernames are not needed here)
+    for user_data in users.values():
+        # Add yearly sick usage counter if missing
+        if "sick_used_ytd" not in user_data:
+            user_data["sick_used_ytd"] = 0
             added_total += 1
-        if removed:
+        # Remove deprecated field if still present
+        if "sick_used_today" in user_data:
+            del user_data["sick_used_today"]
             removed_total += 1
 
     # Provide aggregate stats to caller
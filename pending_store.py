@@ -3,15 +3,22 @@ Pending request store (JSON-backed).
 
 Purpose
 -------
-A tiny persistence layer for **pending vacation requests**. Its shape matches
-legacy `requests_data.requests` entries so the rest of the app can read/write
-without caring where the data lives.
+A tiny persistence layer for **pending vacation requests**. The ON-DISK shape
+matches legacy `requests_data.requests` entries (plain dicts). In memory,
+list_pending() returns `PendingEntry` records instead; callers that need the
+legacy dict shape call `.to_dict()` (e.g. my_requests in app.py).
 
 Design & invariants
 -------------------
 * Storage format: a JSON list of dicts (order preserved).
 * Each entry looks like:
   { user, date, type='vacation', hours, note, status='pending', handled_by='' }
+* `type` is stored lowercase (add_pending normalizes it; PendingEntry.from_dict
+  also lowercases older/hand-edited entries on load), so matching is a plain `==`.
+* In memory, entries are `PendingEntry` records (`__slots__`, attribute access);
+  `to_dict()` converts back at the JSON boundary. Missing fields read as their
+  defaults on the record, but `to_dict()` emits only the keys the stored entry
+  had, so a rewrite never adds `hours: 0.0` / `note: ""` to old entries.
 * Functions here are **best-effort**: they favor continuity over exceptions.
 * Atomic writes ensure readers never observe partial files.
 """
@@ -19,7 +26,8 @@ Design & invariants
 # =============================================================================
 # HOW TO USE (MAINTAINER NOTES)
 # -----------------------------------------------------------------------------
-# - This module is intentionally small and standard-library only.
+# - This module is intentionally small and standard-library only; `orjson` is
+#   used when installed (via atomic_io's shared codec) but never required.
 # - All helpers are "best-effort": if the file is missing or corrupted, we
 #   return safe defaults instead of raising, so the UI continues to function.
 # - Callers should treat this as a persistence boundary and avoid catching
@@ -30,13 +38,56 @@ Design & invariants
 
 # Standard library only; keep this helper dependency‑free
 from __future__ import annotations
-import json, os, tempfile  # json: serialize/deserialize; os: atomic replace; tempfile: safe tmp files
-from typing import Any, Dict, List
+import json, os  # json: decode-error type; os: stat for the read cache
+import threading
+from contextlib import contextmanager
+try:  # mmap is missing on a few exotic platforms; plain reads are the fallback
+    import mmap
+except ImportError:
+    mmap = None
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from atomic_io import HAVE_ORJSON, atomic_write_bytes, dumps_indent, flock_path, loads
 
 # -----------------------------------------------------------------------------
 # Configuration
 # -----------------------------------------------------------------------------
 PENDING_FILE = "pending.json"  # relative to current working directory (see notes above)
+# flock() target for every read-modify-write of the queue; never holds data.
+# Without it two writers (threads or worker processes) can both read N entries
+# and both write N+1, silently losing one update.
+LOCK_FILE = PENDING_FILE + ".lock"
+MMAP_THRESHOLD = 64 * 1024     # below this a single read() is cheaper than mapping
+
+# Parsed-payload cache: path -> ((st_mtime_ns, st_size), payload).
+# A read whose stat() matches the cached signature skips open/read/parse;
+# _atomic_write refreshes the entry after each replace.
+_cache: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+
+
+def _stat_sig(path: str) -> Tuple[int, int]:
+    """(mtime_ns, size) of `path`; raises OSError if it does not exist."""
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _mmap_loads(path: str, size: int) -> Any:
+    """Parse `path` with orjson straight from a read-only mapping (no read() copy).
+    Pages are prefaulted (MAP_POPULATE, Linux) since the parser walks the whole file."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        if hasattr(mmap, "MAP_POPULATE"):
+            mm = mmap.mmap(fd, size, flags=mmap.MAP_SHARED | mmap.MAP_POPULATE,
+                           prot=mmap.PROT_READ)
+        else:
+            mm = mmap.mmap(fd, size, access=mmap.ACCESS_READ)
+    finally:
+        os.close(fd)  # the mapping keeps its own reference
+    try:
+        with memoryview(mm) as view:
+            return loads(view)
+    finally:
+        mm.close()
 
 
 def _read_json(path: str, default: Any) -> Any:
@@ -47,54 +98,183 @@ def _read_json(path: str, default: Any) -> Any:
           is missing or has been hand-edited into an invalid state.
     """
     try:
-        # Open text file (platform default encoding); small file expected
-        with open(path, "r") as f:
-            # Parse JSON payload into Python objects
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError, OSError):
+        # Unchanged since the last read/write? Serve the parsed payload from RAM
+        sig = _stat_sig(path)
+        hit = _cache.get(path)
+        if hit is not None and hit[0] == sig:
+            return hit[1]
+        if HAVE_ORJSON and mmap is not None and sig[1] >= MMAP_THRESHOLD:
+            # Large file: parse from the page cache mapping
+            payload = _mmap_loads(path, sig[1])
+        else:
+            # Read raw bytes (JSON is UTF-8); small file expected
+            with open(path, "rb") as f:
+                raw = f.read()
+            # Parse JSON payload into Python objects (shared codec, see atomic_io)
+            payload = loads(raw)
+        _cache[path] = (sig, payload)
+        return payload
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    except (FileNotFoundError, json.JSONDecodeError, UnicodeDecodeError, OSError, ValueError):
+        # ValueError: mmap of a file truncated between stat() and mapping
         # On any expected read/parse error, fall back to provided default
         return default
 
 
 def _atomic_write(path: str, payload: Any) -> None:
-    """Write JSON atomically using a temp file + os.replace(...).
-    This ensures readers never observe a half‑written file (POSIX/modern Windows).
-    NOTE: We create the temp file in the same directory to keep the replace atomic
-          on the same filesystem. Permissions inherit from the directory defaults.
+    """Write JSON atomically via atomic_io.atomic_write_bytes (temp sibling ->
+    fsync -> os.replace -> fsync(dir)), so readers never observe a half‑written
+    file and a crash never loses the rename. Raises OSError on failure.
     """
-    # Resolve target directory (absolute) for the temp file sibling
-    d = os.path.dirname(os.path.abspath(path)) or "."
-    # Create a unique temp file in target dir; returns low-level file descriptor
-    fd, tmp = tempfile.mkstemp(dir=d, prefix=".pending-", suffix=".json")
-    try:
-        # Wrap the descriptor in a Python file object for JSON dump and auto-close
-        with os.fdopen(fd, "w") as f:
-            # Pretty-print for human diffing; small files keep this cheap
-            json.dump(payload, f, indent=2)
-        # Atomic replace: either the old file stays or the new one fully appears
-        os.replace(tmp, path)  # atomic on POSIX/modern Windows
-    finally:
-        # Best-effort cleanup: remove temp file if something failed before replace
+    # Pretty-print for human diffing; serialize to bytes before touching the disk,
+    # then temp sibling + fsync + atomic replace + dir fsync (see atomic_io)
+    atomic_write_bytes(path, dumps_indent(payload))
+    # Next read of `path` is served from the cache without re-parsing
+    _cache[path] = (_stat_sig(path), payload)
+
+
+class PendingEntry:
+    """One queued request. Slots instead of a per-entry dict: smaller, and the
+    match loop in remove_pending reads attributes directly.
+    Keys outside the known fields (hand edits, future fields) ride along in
+    `extra` so a read-modify-write never drops them; known fields the source
+    dict lacked are listed in `missing` so to_dict() does not invent them."""
+
+    __slots__ = ("user", "date", "type", "hours", "note", "status", "handled_by", "extra",
+                 "missing")
+
+    def __init__(self, user: Any = None, date: Any = None, type: str = "vacation",
+                 hours: Any = 0.0, note: Any = "", status: str = "pending",
+                 handled_by: Any = "", extra: Optional[Dict[str, Any]] = None,
+                 missing: Optional[frozenset] = None) -> None:
+        self.user = user
+        self.date = date
+        self.type = type
+        self.hours = hours
+        self.note = note
+        self.status = status
+        self.handled_by = handled_by
+        self.extra = extra
+        self.missing = missing
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "PendingEntry":
+        extra = {k: v for k, v in d.items() if k not in _ENTRY_FIELDS}
+        typ = d.get("type", "vacation")
+        if isinstance(typ, str) and not typ.islower():
+            # Entries written before lowercase storage (or hand-edited) may say
+            # "Vacation"; normalize once per parse so matching stays a plain ==
+            typ = typ.lower()
+        return cls(
+            user=d.get("user"),
+            date=d.get("date"),
+            type=typ,
+            hours=d.get("hours", 0.0),
+            note=d.get("note", ""),
+            status=d.get("status", "pending"),
+            handled_by=d.get("handled_by", ""),
+            extra=extra or None,
+            missing=(_ENTRY_FIELDS - d.keys()) or None,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = {
+            "user": self.user,
+            "date": self.date,
+            "type": self.type,
+            "hours": self.hours,
+            "note": self.note,
+            "status": self.status,
+            "handled_by": self.handled_by,
+        }
+        if self.missing:
+            for k in self.missing:
+                del d[k]
+        if self.extra:
+            d.update(self.extra)
+        return d
+
+    def __repr__(self) -> str:
+        return "PendingEntry(%r)" % (self.to_dict(),)
+
+
+_ENTRY_FIELDS = frozenset(PendingEntry.__slots__) - {"extra", "missing"}
+
+
+def _write_items(items: List[PendingEntry]) -> None:
+    """Persist entries (as dicts) and prime list_pending's view with them."""
+    global _pending_view
+    payload = [e.to_dict() for e in items]
+    _atomic_write(PENDING_FILE, payload)
+    # _atomic_write cached `payload`; pair it with the entries we already have
+    _pending_view = (payload, list(items))
+
+
+# Per-thread batch state (see pending_batch): `items` is the working list while
+# a batch is open, `dirty` records whether any op changed it.
+_batch = threading.local()
+
+
+def _store_items(items: List[PendingEntry]) -> None:
+    """Inside a batch: mark dirty (flushed once on exit). Otherwise write now."""
+    if getattr(_batch, "items", None) is not None:
+        _batch.dirty = True
+    else:
+        _write_items(items)
+
+
+@contextmanager
+def pending_batch() -> Iterator[None]:
+    """Coalesce add_pending/remove_pending calls into one atomic write.
+
+        with pending_batch():
+            for item in new_items:
+                add_pending(item)
+
+    The file is rewritten once on exit, and only if something changed. If the
+    block raises, the batched changes are discarded. Nested batches join the
+    outermost one; batches are per thread. The queue lock is held for the
+    whole block, so keep batches short.
+    """
+    if getattr(_batch, "items", None) is not None:
+        yield  # nested: the outer batch flushes
+        return
+    with flock_path(LOCK_FILE):
+        _batch.items = list_pending()
+        _batch.dirty = False
         try:
-            if os.path.exists(tmp):
-                os.remove(tmp)
-        except OSError:
-            # Best‑effort cleanup; safe to ignore if the temp file is already gone
-            pass
+            yield
+            if _batch.dirty:
+                _write_items(_batch.items)
+        finally:
+            _batch.items = None
+            _batch.dirty = False
 
 
-def list_pending() -> List[Dict[str, Any]]:
-    """Return all pending items as a list of dicts.
+# (raw payload object, its entries) -- see list_pending()
+_pending_view: Tuple[Any, List[PendingEntry]] = (None, [])
+
+
+def list_pending() -> List[PendingEntry]:
+    """Return all pending items as PendingEntry records (`.to_dict()` for dicts).
 
     Notes:
     - Order is preserved as stored in the file.
     - Defensive: filters out non‑dict entries if the file was manually edited.
     - Never raises on read errors; returns [] in those cases.
+    - Unchanged file (same stat signature): no re-parse and no re-filter; the
+      caller still gets its own list, so appending/popping is safe. Entries
+      are shared between calls -- treat them as read-only.
     """
-    # Load the raw payload (or [] if file missing/corrupt)
+    global _pending_view
+    # Load the raw payload (or [] if file missing/corrupt); cached by stat
     items = _read_json(PENDING_FILE, default=[])
-    # Defensive normalization: only keep dict entries
-    return [x for x in items if isinstance(x, dict)]
+    src, view = _pending_view
+    if src is not items:
+        # Defensive normalization: only keep dict entries
+        view = [PendingEntry.from_dict(x) for x in items if isinstance(x, dict)]
+        _pending_view = (items, view)
+    return list(view)
 
 
 def add_pending(item: Dict[str, Any]) -> None:
@@ -102,24 +282,32 @@ def add_pending(item: Dict[str, Any]) -> None:
     Append one pending entry.
 
     Ensures:
-    - `type` defaults to "vacation"
+    - `type` defaults to "vacation" and is stored lowercase
     - `status` is normalized to "pending" (single source of truth)
     - `handled_by` exists (empty string by default)
     """
     # Copy and normalize input to a plain dict (avoid mutating caller's object)
     item = dict(item or {})
-    # Default missing type to "vacation" to match legacy shape
-    item.setdefault("type", "vacation")
+    # Default missing type to "vacation" to match legacy shape; lowercase once
+    # here so readers never have to normalize per comparison
+    item["type"] = str(item.get("type") or "vacation").lower()
     # Single source of truth: status is always "pending" in this queue
     item["status"] = "pending"
     # Ensure key exists; empty string means "unassigned"
     item.setdefault("handled_by", "")
-    # Read current queue (never raises; returns [] on issues)
-    items = list_pending()
-    # Append new entry preserving list order
-    items.append(item)
-    # Persist updated queue atomically
-    _atomic_write(PENDING_FILE, items)
+    entry = PendingEntry.from_dict(item)
+    if getattr(_batch, "items", None) is not None:
+        # Open batch (already locked): just extend its working list
+        _batch.items.append(entry)
+        _batch.dirty = True
+        return
+    with flock_path(LOCK_FILE):
+        # Read current queue (never raises; returns [] on issues)
+        items = list_pending()
+        # Append new entry preserving list order
+        items.append(entry)
+        # Persist updated queue atomically
+        _write_items(items)
 
 
 def remove_pending(user: str, date: str, typ: str = "vacation") -> bool:
@@ -127,28 +315,30 @@ def remove_pending(user: str, date: str, typ: str = "vacation") -> bool:
     Remove the first entry matching (user, date, type).
 
     Returns:
-        True if an item was removed and the file updated; False otherwise.
+        True if an item was removed and the file updated (or, inside
+        pending_batch(), scheduled for the batch's write); False otherwise.
 
     Intentional behavior: only the **first** matching entry is removed to
     preserve potential duplicates added by mistake; callers can loop if needed.
     """
-    # Read current snapshot of the queue
-    items = list_pending()
-    # Prepare output list and a flag to indicate a single removal
-    out, removed = [], False
-    # Iterate in order, copying items unless the first match is found
-    for it in items:
-        # Match on user, date, and case-insensitive type
-        if (not removed
-            and it.get("user") == user
-            and it.get("date") == date
-            and (it.get("type") or "").lower() == (typ or "").lower()):
-            # Mark that we've removed exactly one matching item
-            removed = True
-            continue
-        out.append(it)
-    if removed:
-        # Write the pruned list back to disk atomically
-        _atomic_write(PENDING_FILE, out)
-    # Report whether we actually removed an entry
-    return removed
+    if getattr(_batch, "items", None) is not None:
+        # Open batch (already locked): work on its list; flushed on exit
+        return _remove_first(_batch.items, user, date, typ)
+    with flock_path(LOCK_FILE):
+        # Fresh snapshot (safe to mutate), read under the lock
+        return _remove_first(list_pending(), user, date, typ)
+
+
+def _remove_first(items: List[PendingEntry], user: str, date: str, typ: str) -> bool:
+    """Pop the first (user, date, type) match from `items` and persist it (or
+    mark the open batch dirty). Caller holds the queue lock."""
+    want_type = (typ or "").lower()  # stored types are lowercase (see add_pending)
+    # Find the first match, then pop it in place -- no rebuilt copy of the list
+    for i, it in enumerate(items):
+        if it.user == user and it.date == date and it.type == want_type:
+            items.pop(i)
+            # Write the pruned list back to disk atomically (or defer to the batch)
+            _store_items(items)
+            return True
+    # No matching entry; nothing written
+    return False
@@ -1,24 +1,172 @@
-import json
+import atexit
 import os
-from typing import List, Dict, Any
+from collections.abc import Sequence
+from typing import List, Dict, Any, Optional, IO, Iterator
+
+try:  # optional: stream the one-time legacy conversion element by element
+    import ijson
+except ImportError:
+    ijson = None
+
+from atomic_io import atomic_open, dumps_line, flock_path, loads
+
+# JSON Lines: one entry per line, so an append never rewrites the history
+REQUEST_LOG_PATH = "request_log.jsonl"
+# Older builds kept the whole log as one indented JSON array
+LEGACY_REQUEST_LOG_PATH = "request_log.json"
+# flock() target; a separate file because compaction replaces the log's inode
+REQUEST_LOG_LOCK_PATH = REQUEST_LOG_PATH + ".lock"
+
+APPEND_BUFFER_SIZE = 1 << 16
+REWRITE_BUFFER_SIZE = 1 << 20  # full rewrites: many small lines per write(2)
+
+# Fields stored lowercase so readers can compare with plain `==`
+CANONICAL_LOWER_FIELDS = ("type", "status")
+
+
+def _normalize_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Lowercase `type`/`status` in place (canonical form); returns the entry."""
+    for key in CANONICAL_LOWER_FIELDS:
+        val = entry.get(key)
+        if isinstance(val, str) and not val.islower():
+            entry[key] = val.lower()
+    return entry
+
+
+def _iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream entries one line at a time; a torn/corrupt line is skipped, not fatal."""
+    with open(path, "rb") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = loads(line)
+            except ValueError:  # orjson/json decode errors both subclass ValueError
+                continue
+            if isinstance(entry, dict):
+                yield entry
+
+
+def _load_jsonl(path: str) -> List[Dict[str, Any]]:
+    """All entries of a JSONL log (only parsed entries are held, never the file)."""
+    return list(_iter_jsonl(path))
+
+
+def _iter_legacy(path: str) -> Iterator[Any]:
+    """Elements of the legacy JSON array: streamed with ijson when installed,
+    otherwise parsed in one go (atomic_io.loads)."""
+    with open(path, "rb") as f:
+        if ijson is not None:
+            # use_float: plain floats for `hours` instead of Decimal
+            yield from ijson.items(f, "item", use_float=True)
+            return
+        raw = f.read()
+    yield from loads(raw)
+
+
+def _write_all(path: str, entries: List[Dict[str, Any]]) -> None:
+    """Rewrite `path` as JSON Lines via atomic_io.atomic_open (temp file + fsync
+    + os.replace + dir fsync).
+    Each entry is serialized straight into the buffered writer, so peak memory
+    is one line, not a second copy of the whole log."""
+    with atomic_open(path, buffering=REWRITE_BUFFER_SIZE) as f:
+        write = f.write
+        for e in entries:
+            write(dumps_line(e))
+
+
+# Legacy-array parse failures that fall back to an empty log. json/orjson decode
+# errors subclass ValueError; ijson has its own JSONError hierarchy. I/O errors
+# are NOT in here: see _load_or_migrate.
+_PARSE_ERRORS = (ValueError,) + ((ijson.JSONError,) if ijson is not None else ())
+
+
+def _load_or_migrate() -> List[Dict[str, Any]]:
+    """Load the JSONL log; on first run convert the legacy JSON array once.
+
+    The exists-check and the conversion run under the log lock, so a second
+    worker re-checks after the first finished and never replaces a log that
+    already has appends. Only an unparseable legacy file falls back to []
+    (the file is left in place). A failed read or write raises: returning []
+    would let the next append create request_log.jsonl, after which the
+    legacy history would never be converted.
+    """
+    if not os.path.exists(REQUEST_LOG_PATH) and os.path.exists(LEGACY_REQUEST_LOG_PATH):
+        with flock_path(REQUEST_LOG_LOCK_PATH):
+            # Re-check: another worker may have converted while we waited
+            if not os.path.exists(REQUEST_LOG_PATH):
+                try:
+                    entries = [
+                        _normalize_entry(e)
+                        for e in _iter_legacy(LEGACY_REQUEST_LOG_PATH)
+                        if isinstance(e, dict)
+                    ]
+                except FileNotFoundError:
+                    return []
+                except _PARSE_ERRORS:
+                    return []  # corrupt legacy file: kept as-is for manual repair
+                # The legacy file is left in place as a backup
+                _write_all(REQUEST_LOG_PATH, entries)
+                return entries
+    try:
+        return _load_jsonl(REQUEST_LOG_PATH)  # torn/corrupt lines are skipped
+    except FileNotFoundError:
+        return []
 
-REQUEST_LOG_PATH = "request_log.json"
 
 # Load existing log on import (safe fallback to empty list)
-if os.path.exists(REQUEST_LOG_PATH):
+request_log: List[Dict[str, Any]] = _load_or_migrate()
+
+# One-time migration: older entries may carry mixed-case type/status
+for _entry in request_log:
+    _normalize_entry(_entry)
+
+# Persistent append handle, opened on first write
+_log_fp: Optional[IO[bytes]] = None
+
+
+def _close_log_fp() -> None:
+    global _log_fp
+    if _log_fp is not None:
+        try:
+            _log_fp.close()
+        except OSError:
+            pass
+        _log_fp = None
+
+
+atexit.register(_close_log_fp)
+
+
+def _log_fp_stale() -> bool:
+    """True if another process compacted (replaced) the log under our handle."""
     try:
-        with open(REQUEST_LOG_PATH) as f:
-            request_log: List[Dict[str, Any]] = json.load(f)
-    except (json.JSONDecodeError, OSError):
-        request_log = []
-else:
-    request_log = []
+        return os.fstat(_log_fp.fileno()).st_ino != os.stat(REQUEST_LOG_PATH).st_ino
+    except OSError:
+        return True
 
 
-def save_request_log() -> None:
-    """Persist the in-memory request_log to disk with pretty formatting."""
-    with open(REQUEST_LOG_PATH, "w") as f:
-        json.dump(request_log, f, indent=2)
+def compact_request_log() -> None:
+    """Rewrite the on-disk log from the file itself (occasional compaction /
+    repair), dropping torn or corrupt lines that the loader skips.
+    Rebuilt from disk, not from memory: other worker processes may have
+    appended lines this process never loaded. The in-memory log is refreshed
+    to match afterwards."""
+    # No other process appends while the file is read and replaced
+    with flock_path(REQUEST_LOG_LOCK_PATH):
+        _close_log_fp()
+        try:
+            entries = _load_jsonl(REQUEST_LOG_PATH)
+        except FileNotFoundError:
+            entries = list(request_log)  # nothing on disk yet (e.g. deleted by hand)
+        _write_all(REQUEST_LOG_PATH, entries)
+        # In place: app.py and the read-only view hold references to this list
+        request_log[:] = entries
+
+
+# Older name; normal appends never need a full rewrite
+save_request_log = compact_request_log
 
 
 def log_request(entry: Dict[str, Any]) -> None:
@@ -26,11 +174,66 @@ def log_request(entry: Dict[str, Any]) -> None:
     Append a single request entry to the in-memory log and persist immediately.
     Expected entry keys include:
       user, name, call_sign, sector, date, hours, status, handled_by, timestamp
+    `type` and `status` are normalized to lowercase on the way in.
+    Only the new line is written (one write + fsync); the existing history is
+    never rewritten -- see compact_request_log() for that.
+    The write happens under an exclusive flock() so lines from several worker
+    processes never interleave, even when one is longer than the buffer.
     """
-    request_log.append(entry)
-    save_request_log()
+    global _log_fp
+    line = dumps_line(_normalize_entry(entry))
+    with flock_path(REQUEST_LOG_LOCK_PATH):
+        # Under the lock so a concurrent compaction cannot drop it from memory
+        request_log.append(entry)
+        if _log_fp is not None and _log_fp_stale():
+            _close_log_fp()  # reopen so the line lands in the current file
+        if _log_fp is None:
+            _log_fp = open(REQUEST_LOG_PATH, "ab", buffering=APPEND_BUFFER_SIZE)
+        _log_fp.write(line)
+        _log_fp.flush()
+        os.fsync(_log_fp.fileno())  # audit trail: durable before the response goes out
+
+
+class _RequestLogView(Sequence):
+    """Read-only, zero-copy view of the live log (len/index/slice/iterate).
+    Appends made through log_request() show up in the view immediately."""
+
+    __slots__ = ("_src",)
+
+    def __init__(self, src: List[Dict[str, Any]]) -> None:
+        self._src = src
 
+    def __getitem__(self, i):
+        return self._src[i]  # a slice returns a (copied) list, like list slicing
 
-def get_request_log() -> List[Dict[str, Any]]:
-    """Return a shallow copy of the current in-memory log for read-only use."""
-    return list(request_log)
+    def __len__(self) -> int:
+        return len(self._src)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._src)
+
+    def __repr__(self) -> str:
+        return "<request log view: %d entries>" % len(self._src)
+
+
+_request_log_view = _RequestLogView(request_log)
+
+
+def get_request_log() -> Sequence:
+    """Return a read-only view of the in-memory log (no per-call copy).
+    Call list() on it if a snapshot that ignores later appends is needed."""
+    return _request_log_view
+
+
+def iter_request_log() -> Iterator[Dict[str, Any]]:
+    """Stream request_log.jsonl one line at a time (for history templates).
+
+    Reads the file, not this process's in-memory list, so lines appended by
+    other worker processes show up too, and only one parsed entry is held at a
+    time. Corrupt lines are skipped; a missing file yields nothing.
+    """
+    try:
+        for entry in _iter_jsonl(REQUEST_LOG_PATH):
+            yield _normalize_entry(entry)  # no-op for lines written by log_request
+    except FileNotFoundError:
+        return
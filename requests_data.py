@@ -13,8 +13,57 @@ Each request should be a dict with keys:
     - note (str): Optional note from the user
     - status (str): 'pending' for vacation, 'logged' for sick
     - handled_by (str): Admin ID assigned to handle the request
+
+`type` and `status` are always stored lowercase (writers normalize once), so
+readers compare them with plain `==` instead of calling `.lower()` per entry.
+
+Writers go through add_request()/remove_request() so the (user, date, type)
+index below stays in step with the list; lookups use find_request(). Both
+writers bump `version`, which page caches use to notice queue changes.
 '''
 
-# The global list of pending requests; append new entries here
+from typing import Any, Dict, List, Optional, Tuple
+
+# The global list of pending requests (display order); mutate via the helpers below
 
 requests = []
+
+# (user, date, type) -> queued entries for that key, oldest first
+pending_by_key: Dict[Tuple[Any, Any, Any], List[Dict[str, Any]]] = {}
+
+# Incremented on every add/remove
+version = 0
+
+
+def _key(req: Dict[str, Any]) -> Tuple[Any, Any, Any]:
+    return (req.get("user"), req.get("date"), req.get("type"))
+
+
+def add_request(req: Dict[str, Any]) -> None:
+    """Append `req` to the queue and index it."""
+    global version
+    requests.append(req)
+    version += 1
+    pending_by_key.setdefault(_key(req), []).append(req)
+
+
+def find_request(user: str, date: str, type_: str = "vacation") -> Optional[Dict[str, Any]]:
+    """Oldest queued entry for (user, date, type), or None (dict lookup, no scan)."""
+    bucket = pending_by_key.get((user, date, type_))
+    return bucket[0] if bucket else None
+
+
+def remove_request(req: Dict[str, Any]) -> None:
+    """Drop `req` (matched by identity) from the queue and the index."""
+    global version
+    version += 1
+    key = _key(req)
+    bucket = pending_by_key.get(key)
+    if bucket:
+        bucket[:] = [r for r in bucket if r is not req]
+        if not bucket:
+            del pending_by_key[key]
+    for idx, r in enumerate(requests):
+        if r is req:
+            del requests[idx]
+            break
@@ -10,21 +10,25 @@ Usage:
     This helps in testing the annual reset logic without waiting for January 1st.
 '''
 
-import json
+from pathlib import Path
+
+from atomic_io import loads  # shared JSON codec (orjson when installed)
+from fix_users import atomic_write_json  # temp file + fsync + replace (crash-safe)
 
 ### Load current user data ###
-with open("users.json", "r") as f:
-    users = json.load(f)
+users = loads(Path("users.json").read_bytes())
 
 ### Reset yearly sick usage for all users ###
-for username, user_data in users.items():
+# A parsed pass (not a byte-level regex) so users missing the key get it too and
+# nothing nested inside audit trails is touched.
+for user_data in users.values():
     # Forcefully set sick_used_ytd to zero for test verification
     user_data["sick_used_ytd"] = 0
 
 ### Persist changes ###
-with open("users.json", "w") as f:
-    # Use indentation for readability
-    json.dump(users, f, indent=2)
+# Atomic replace: a crash mid-write leaves the original users.json intact
+# (a plain open("w") would truncate it first)
+atomic_write_json(Path("users.json"), users)
 
 # Provide feedback to operator
 print("✅ All users' 'sick_used_ytd' fields have been reset to 0.")